@@ -0,0 +1,16 @@
+// Fails when the gzipped size of the built main.css exceeds the cssBudget, in
+// bytes, of package.json.
+const fs = require("fs");
+const zlib = require("zlib");
+
+const budget = require("../../../package.json").config.cssBudget;
+const css = fs.readFileSync("learou/static/css/main.css");
+const size = zlib.gzipSync(css, { level: 9 }).length;
+
+console.log(
+  `css/main.css ${(size / 1024).toFixed(1)} / ${(budget / 1024).toFixed(1)} KiB`,
+);
+if (size > budget) {
+  console.error("css/main.css is over its size budget");
+  process.exit(1);
+}
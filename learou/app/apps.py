@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class LearouAppConfig(AppConfig):
+    name = "learou.app"
+    label = "app"
+
+    def ready(self):
+        from learou.app import signals  # noqa: F401
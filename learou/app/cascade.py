@@ -0,0 +1,250 @@
+"""
+Soft deletion.
+
+Deleting an item only sets its deleted_at, and that of every row deleting it
+would delete through on_delete=CASCADE, all with the same time. The default
+managers leave them out right away. They stay in the database, restorable,
+for SOFT_DELETE_RETENTION_HOURS, then purge_deleted removes them in batches.
+
+The cascade is followed relation by relation with subqueries, the rows are
+never loaded.
+"""
+
+import logging
+from collections import deque
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from learou.app.models import AbstractType, bump_model_generation
+
+logger = logging.getLogger(__name__)
+
+
+def soft_deletable(model):
+    return issubclass(model, AbstractType)
+
+
+def cascade_relations(model):
+    """
+    Returns the relations to the model whose rows are deleted with it.
+    """
+    return [
+        relation
+        for relation in model._meta.related_objects
+        if not relation.many_to_many and relation.on_delete is models.CASCADE
+    ]
+
+
+def cascade(queryset):
+    """
+    Yields the queryset and, breadth first, a queryset of the rows of each
+    relation that deleting it would delete through on_delete=CASCADE, deleted
+    rows included. Each one is a subquery of the previous, nothing is loaded.
+
+    A relation back to a model already on the way, such as Project.parent, is
+    followed one level at a time while it still finds rows.
+    """
+    queue = deque([(queryset, frozenset())])
+    while queue:
+        rows, path = queue.popleft()
+        yield rows
+
+        path = path | {rows.model}
+        for relation in cascade_relations(rows.model):
+            related = relation.related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": rows.values(relation.field_name)}
+            )
+            if relation.related_model in path and not related.exists():
+                continue
+            queue.append((related, path))
+
+
+def instance_cascade(instance):
+    return cascade(type(instance)._base_manager.filter(pk=instance.pk))
+
+
+def cascade_counts(instance):
+    """
+    Returns the (model, rows) that deleting the instance would also delete,
+    in cascade order, with one COUNT per model. Deleted rows aren't counted,
+    nor the internal rows of models that aren't soft deleted, such as the
+    link metadata.
+    """
+    querysets = {}
+    for rows in instance_cascade(instance):
+        if soft_deletable(rows.model):
+            querysets.setdefault(rows.model, []).append(rows)
+
+    counts = []
+    for model, model_querysets in querysets.items():
+        # A row reachable through several relations counts once.
+        condition = Q()
+        for rows in model_querysets:
+            condition |= Q(pk__in=rows.values("pk"))
+        related = model.objects.filter(condition)
+        if model is type(instance):
+            related = related.exclude(pk=instance.pk)
+
+        count = related.count()
+        if count:
+            counts.append((model, count))
+    return counts
+
+
+class RestoreError(Exception):
+    pass
+
+
+def cascade_parents(model):
+    """
+    Returns the foreign keys of the model to soft deletable rows that delete
+    it with them.
+    """
+    return [
+        field
+        for field in model._meta.fields
+        if field.many_to_one
+        and field.remote_field.on_delete is models.CASCADE
+        and soft_deletable(field.related_model)
+    ]
+
+
+def deleted_parent(model):
+    """
+    Matches the rows with a soft deleted parent through a cascading foreign
+    key, purging the parent would delete them.
+    """
+    condition = Q()
+    for field in cascade_parents(model):
+        condition |= Q(**{f"{field.name}__deleted_at__isnull": False})
+    return condition
+
+
+def mark(instance, rows_filter, deleted_at, skip_orphans=False):
+    """
+    Sets deleted_at on the rows of the cascade of the instance that match the
+    filter, returns the {model: rows} changed. With skip_orphans, the rows
+    whose parent is still deleted are left alone. The cascade is walked
+    parents first, so the parents changed here are already restored.
+    """
+    changed = {}
+    with transaction.atomic():
+        for rows in list(instance_cascade(instance)):
+            if not soft_deletable(rows.model):
+                continue
+            rows = rows.filter(**rows_filter)
+            if skip_orphans:
+                rows = rows.exclude(deleted_parent(rows.model))
+            count = rows.update(deleted_at=deleted_at, version=F("version") + 1)
+            if count:
+                changed[rows.model] = changed.get(rows.model, 0) + count
+
+    # The updates skip the signals.
+    for model in changed:
+        bump_model_generation(model)
+    return changed
+
+
+def soft_delete(instance):
+    """
+    Hides the instance and the rows that would be deleted with it, returns the
+    {model: rows} deleted.
+    """
+    instance.deleted_at = timezone.now()
+    return mark(instance, {"deleted_at__isnull": True}, instance.deleted_at)
+
+
+def restore(instance):
+    """
+    Brings back the instance and the rows deleted with it, those that have
+    the same deleted_at, except the ones another deleted row would still
+    take with it. Returns the {model: rows} restored.
+
+    Raises RestoreError when the instance itself has a deleted parent, the
+    deletion has to be restored from that parent.
+    """
+    if instance.deleted_at is None:
+        return {}
+
+    for field in cascade_parents(type(instance)):
+        parent = getattr(instance, field.name)
+        if parent is not None and parent.deleted_at is not None:
+            raise RestoreError(
+                f"{instance} belongs to the deleted {parent}, restore "
+                f"{type(parent).__name__} {parent.pk} first"
+            )
+
+    deleted_at, instance.deleted_at = instance.deleted_at, None
+    return mark(instance, {"deleted_at": deleted_at}, None, skip_orphans=True)
+
+
+def purge_order():
+    """
+    Returns the soft deletable models, those whose rows are deleted with the
+    rows of another before it, so a batch doesn't cascade into the next ones.
+    """
+    order = []
+    visited = set()
+
+    def visit(model):
+        if model in visited:
+            return
+        visited.add(model)
+        for relation in cascade_relations(model):
+            visit(relation.related_model)
+        order.append(model)
+
+    for model in apps.get_app_config("app").get_models():
+        if soft_deletable(model):
+            visit(model)
+    return [model for model in order if soft_deletable(model)]
+
+
+def expired_rows(model):
+    cutoff = timezone.now() - timedelta(hours=settings.SOFT_DELETE_RETENTION_HOURS)
+    return model.all_objects.filter(deleted_at__lt=cutoff)
+
+
+def purge_deleted(batch_size=None, max_batches=None, progress=None):
+    """
+    Deletes the rows deleted more than SOFT_DELETE_RETENTION_HOURS ago,
+    batch_size rows per transaction, at most max_batches batches. Calls
+    progress(model, purged, remaining) after each batch.
+
+    Returns the {model: rows} purged and whether every expired row is gone.
+    """
+    batch_size = batch_size or settings.SOFT_DELETE_PURGE_BATCH_SIZE
+    purged = {}
+    batches = 0
+    for model in purge_order():
+        expired = expired_rows(model)
+        while True:
+            if max_batches is not None and batches >= max_batches:
+                return purged, False
+
+            # Newest first, the children of a self relation such as
+            # Project.parent usually come after their parent.
+            pks = list(
+                expired.order_by("-pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic():
+                model.all_objects.filter(pk__in=pks).delete()
+            batches += 1
+            purged[model] = purged.get(model, 0) + len(pks)
+
+            remaining = expired.count()
+            logger.info(
+                "Purged %s %s rows, %s left", purged[model], model.__name__, remaining
+            )
+            if progress:
+                progress(model, purged[model], remaining)
+
+    return purged, True
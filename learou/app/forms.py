@@ -1,105 +1,279 @@
 from django import forms
+from django.core import signing
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Model, QuerySet
 
 from learou.app import models
 
 
-class ProjectTypeForm(forms.ModelForm):
+class M2MDeltaFormMixin:
+    """
+    Saves the many to many fields of a model form by removing and adding only
+    the relations that changed, compared with the values the form was loaded
+    with, instead of clearing and inserting every row with set(). All the
+    relations are written in one transaction. The related managers still send
+    m2m_changed, which bumps the versions.
+    """
+
+    def _save_m2m(self):
+        opts = self.instance._meta
+        with transaction.atomic():
+            for field in opts.many_to_many:
+                name = field.name
+                if self._meta.fields and name not in self._meta.fields:
+                    continue
+                if self._meta.exclude and name in self._meta.exclude:
+                    continue
+                if name not in self.cleaned_data:
+                    continue
+
+                self.save_m2m_delta(field, self.cleaned_data[name])
+
+    def save_m2m_delta(self, field, selected):
+        initial = self.get_initial_for_field(self.fields[field.name], field.name)
+        current = {getattr(obj, "pk", obj) for obj in initial or ()}
+        selected = {obj.pk for obj in selected}
+
+        related = getattr(self.instance, field.name)
+        if current - selected:
+            related.remove(*(current - selected))
+        if selected - current:
+            related.add(*(selected - current))
+
+
+def snapshot_value(value):
+    """
+    Returns a comparable string, or sorted list of strings, for a form value:
+    an initial value, a cleaned one or a model attribute.
+    """
+    if hasattr(value, "all"):
+        value = value.all()
+    if isinstance(value, (list, tuple, QuerySet)):
+        return sorted(str(getattr(item, "pk", item)) for item in value)
+    if isinstance(value, Model):
+        return str(value.pk)
+    if isinstance(value, File):
+        return value.name or ""
+    if value is None:
+        return ""
+    return str(value)
+
+
+class VersionedModelForm(M2MDeltaFormMixin, forms.ModelForm):
+    """
+    Carries the version of the object it was loaded with, so saving an object
+    somebody else changed in the meantime raises VersionConflict instead of
+    overwriting their changes. It also carries the values it was loaded with,
+    signed, to tell which fields each side changed.
+    """
+
+    SNAPSHOT_EXCLUDED_FIELDS = ["version", "loaded"]
+    LOADED_SALT = "learou.app.forms.loaded"
+
+    version = forms.IntegerField(widget=forms.HiddenInput, required=False)
+    loaded = forms.CharField(widget=forms.HiddenInput, required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields["version"].initial = self.instance.version
+            self.fields["loaded"].initial = signing.dumps(
+                self.initial_snapshot(), salt=self.LOADED_SALT
+            )
+
+    def snapshot_fields(self):
+        return [
+            name for name in self.fields if name not in self.SNAPSHOT_EXCLUDED_FIELDS
+        ]
+
+    def initial_snapshot(self):
+        return {
+            name: snapshot_value(self.get_initial_for_field(self.fields[name], name))
+            for name in self.snapshot_fields()
+        }
+
+    def cleaned_snapshot(self):
+        return {
+            name: snapshot_value(self.cleaned_data.get(name))
+            for name in self.snapshot_fields()
+        }
+
+    def loaded_snapshot(self):
+        """
+        Returns the snapshot of the values the form was loaded with, None
+        when it's missing or was tampered with.
+        """
+        try:
+            return signing.loads(
+                self.cleaned_data.get("loaded") or "", salt=self.LOADED_SALT
+            )
+        except signing.BadSignature:
+            return None
+
+    def save(self, commit=True):
+        expected_version = self.cleaned_data.get("version")
+        if not commit or self.instance._state.adding or expected_version is None:
+            return super().save(commit)
+
+        if self.errors:
+            raise ValueError(
+                f"The {self.instance._meta.object_name} could not be changed "
+                "because the data didn't validate."
+            )
+        self.instance.save(expected_version=expected_version)
+        self._save_m2m()
+        return self.instance
+
+
+class FieldForm(VersionedModelForm):
+    """
+    Edits a single field, built with
+    modelform_factory(model, form=FieldForm, fields=[name]). Only that field is
+    validated and written: a column with save(update_fields=...), a many to
+    many relation by adding and removing the rows that changed.
+    """
+
+    def save(self, commit=True):
+        (name,) = self._meta.fields
+        if not self.instance._meta.get_field(name).many_to_many:
+            self.instance.save(
+                update_fields=[name],
+                expected_version=self.cleaned_data.get("version"),
+            )
+            return self.instance
+
+        # Adding and removing rows doesn't overwrite anybody else's changes,
+        # the version isn't checked.
+        self._save_m2m()
+        return self.instance
+
+
+class ProjectTypeForm(VersionedModelForm):
     class Meta:
         model = models.ProjectType
         fields = "__all__"
 
 
-class TaskForm(forms.ModelForm):
+class TaskForm(VersionedModelForm):
     class Meta:
         model = models.Task
         fields = "__all__"
 
 
-class TaskTypeForm(forms.ModelForm):
+class TaskTypeForm(VersionedModelForm):
     class Meta:
         model = models.TaskType
         fields = "__all__"
 
 
-class TaskStatusForm(forms.ModelForm):
+class TaskStatusForm(VersionedModelForm):
     class Meta:
         model = models.TaskStatus
         fields = "__all__"
 
 
-class LinkTypeForm(forms.ModelForm):
+class LinkTypeForm(VersionedModelForm):
     class Meta:
         model = models.LinkType
         fields = "__all__"
 
 
-class LinkForm(forms.ModelForm):
+class LinkForm(VersionedModelForm):
     class Meta:
         model = models.Link
         fields = "__all__"
 
 
-class ReviewForm(forms.ModelForm):
+class ReviewForm(VersionedModelForm):
     class Meta:
         model = models.Review
         fields = "__all__"
 
 
-class AuthorForm(forms.ModelForm):
+class AuthorForm(VersionedModelForm):
     class Meta:
         model = models.Author
         fields = "__all__"
 
 
-class BibliographyTypeForm(forms.ModelForm):
+class BibliographyTypeForm(VersionedModelForm):
     class Meta:
         model = models.BibliographyType
         fields = "__all__"
 
 
-class BibliographyForm(forms.ModelForm):
+class BibliographyForm(VersionedModelForm):
     class Meta:
         model = models.Bibliography
         fields = "__all__"
 
 
-class CheatSheetForm(forms.ModelForm):
+class CheatSheetForm(VersionedModelForm):
     class Meta:
         model = models.CheatSheet
         fields = "__all__"
 
 
-class TechnologyForm(forms.ModelForm):
+class TechnologyForm(VersionedModelForm):
     class Meta:
         model = models.Technology
         fields = "__all__"
 
 
-class ProjectStatusForm(forms.ModelForm):
+class ProjectStatusForm(VersionedModelForm):
     class Meta:
         model = models.ProjectStatus
         fields = "__all__"
 
 
-class ProjectForm(forms.ModelForm):
+class ProjectForm(VersionedModelForm):
     class Meta:
         model = models.Project
         fields = "__all__"
 
 
-class DiaryForm(forms.ModelForm):
+class DiaryForm(VersionedModelForm):
     class Meta:
         model = models.Diary
         fields = "__all__"
 
 
-class DiaryEntryForm(forms.ModelForm):
+class DiaryEntryForm(VersionedModelForm):
     class Meta:
         model = models.DiaryEntry
         fields = "__all__"
 
 
-class MilestoneForm(forms.ModelForm):
+class MilestoneForm(VersionedModelForm):
     class Meta:
         model = models.Milestone
         fields = "__all__"
+
+
+class DiaryTimelineForm(forms.Form):
+    """
+    Period, bucket size and keyset cursor of the diary timeline. The cursor is
+    the date and pk of the last entry of the previous page.
+    """
+
+    BUCKETS = (
+        ("day", "Day"),
+        ("week", "Week"),
+        ("month", "Month"),
+    )
+
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    bucket = forms.ChoiceField(choices=BUCKETS, required=False)
+    before = forms.DateField(required=False)
+    before_pk = forms.IntegerField(required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start"), cleaned_data.get("end")
+        if start and end and start > end:
+            raise forms.ValidationError("The start must be before the end")
+        if bool(cleaned_data.get("before")) != bool(cleaned_data.get("before_pk")):
+            raise forms.ValidationError("before and before_pk go together")
+        return cleaned_data
@@ -0,0 +1,164 @@
+"""
+Concurrent health check of the Link urls.
+
+Links are checked by a bounded thread pool. Each thread keeps its own
+requests session, so the connections to a host are reused between links, and
+every host has a limit on concurrent requests and a minimum interval between
+them, so a site with many links isn't hammered.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.db.models import F
+from django.utils import timezone
+
+from learou.app.models import Link, bump_model_generation
+
+USER_AGENT = "learou-linkcheck/1.0"
+
+# Some servers refuse HEAD, the check is repeated with a GET then.
+HEAD_REFUSED = {403, 405, 501}
+
+RESULT_FIELDS = [
+    "status_code",
+    "final_url",
+    "latency",
+    "check_error",
+    "last_checked_at",
+]
+
+# The results that make a new version of the link, the latency and the time
+# of the check change every time.
+VERSIONED_RESULT_FIELDS = ["status_code", "final_url", "check_error"]
+
+
+@dataclass
+class LinkCheckResult:
+    status_code: int | None
+    final_url: str
+    latency: float | None
+    error: str = ""
+
+
+class HostLimiter:
+    """
+    Allows ``concurrency`` requests at a time to a host, started at least
+    ``interval`` seconds apart.
+    """
+
+    def __init__(self, concurrency, interval):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        with self.lock:
+            start = max(time.monotonic(), self.next_start)
+            self.next_start = start + self.interval
+        time.sleep(max(0.0, start - time.monotonic()))
+
+    def __exit__(self, *exc_info):
+        self.semaphore.release()
+
+
+class LinkChecker:
+    def __init__(self, workers=32, per_host=4, per_host_interval=0.1, timeout=10):
+        self.workers = workers
+        self.per_host = per_host
+        self.per_host_interval = per_host_interval
+        self.timeout = timeout
+        self.local = threading.local()
+        self.limiters = {}
+        self.limiters_lock = threading.Lock()
+
+    @property
+    def session(self):
+        if not hasattr(self.local, "session"):
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            # A thread makes one request at a time, but keeps a connection to
+            # many hosts.
+            adapter = HTTPAdapter(pool_connections=100, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self.local.session = session
+        return self.local.session
+
+    def limiter(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self.limiters_lock:
+            if host not in self.limiters:
+                self.limiters[host] = HostLimiter(self.per_host, self.per_host_interval)
+            return self.limiters[host]
+
+    def request(self, method, url):
+        """
+        Returns the response and its latency, which doesn't include the wait
+        for the other requests to the host.
+        """
+        with self.limiter(url):
+            start = time.perf_counter()
+            # stream avoids downloading the body of the GET fallback.
+            response = self.session.request(
+                method, url, timeout=self.timeout, allow_redirects=True, stream=True
+            )
+            response.close()
+            return response, time.perf_counter() - start
+
+    def check(self, url):
+        try:
+            response, latency = self.request("HEAD", url)
+            if response.status_code in HEAD_REFUSED:
+                response, latency = self.request("GET", url)
+        except requests.RequestException as e:
+            return LinkCheckResult(None, "", None, f"{type(e).__name__}: {e}"[:255])
+
+        return LinkCheckResult(response.status_code, response.url, latency)
+
+    def check_links(self, queryset, chunk_size=500):
+        """
+        Checks the links of the queryset and stores the results, a chunk at a
+        time. Yields the number of links checked after each chunk.
+        """
+        pks = list(queryset.values_list("pk", flat=True))
+        changed_any = False
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for offset in range(0, len(pks), chunk_size):
+                chunk = list(
+                    Link.objects.filter(pk__in=pks[offset : offset + chunk_size])
+                    .only("pk", "url", *VERSIONED_RESULT_FIELDS)
+                    .order_by("pk")
+                )
+                results = executor.map(self.check, [link.url for link in chunk])
+                now = timezone.now()
+                changed = []
+                for link, result in zip(chunk, results):
+                    previous = [
+                        getattr(link, field) for field in VERSIONED_RESULT_FIELDS
+                    ]
+                    link.status_code = result.status_code
+                    link.final_url = result.final_url
+                    link.latency = result.latency
+                    link.check_error = result.error
+                    link.last_checked_at = now
+                    if previous != [
+                        getattr(link, field) for field in VERSIONED_RESULT_FIELDS
+                    ]:
+                        changed.append(link.pk)
+
+                Link.objects.bulk_update(chunk, RESULT_FIELDS)
+                if changed:
+                    Link.objects.filter(pk__in=changed).update(version=F("version") + 1)
+                    changed_any = True
+                yield offset + len(chunk)
+
+        if changed_any:
+            bump_model_generation(Link)
@@ -0,0 +1,102 @@
+"""
+Title, description and favicon of the pages behind the links.
+
+Refreshes send the ETag and Last-Modified of the previous response, so an
+unchanged page costs a 304 and no parsing.
+"""
+
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from django.utils import timezone
+
+from learou.app.linkcheck import USER_AGENT
+from learou.app.models import Link, LinkMetadata, bump_model_generation
+
+# The head is all that's needed, don't download huge pages entirely.
+MAX_PAGE_BYTES = 512 * 1024
+
+FETCH_TIMEOUT = 10
+
+
+def read_page(response):
+    content = b""
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        content += chunk
+        if len(content) >= MAX_PAGE_BYTES or b"</head>" in content:
+            break
+    return content
+
+
+def meta_content(soup, *selectors):
+    for selector in selectors:
+        tag = soup.select_one(selector)
+        if tag and tag.get("content"):
+            return tag["content"].strip()
+    return ""
+
+
+def parse_metadata(content, base_url, encoding=None):
+    soup = BeautifulSoup(content, "html.parser", from_encoding=encoding)
+
+    title = meta_content(soup, 'meta[property="og:title"]')
+    if not title and soup.title and soup.title.string:
+        title = soup.title.string.strip()
+
+    description = meta_content(
+        soup, 'meta[name="description"]', 'meta[property="og:description"]'
+    )
+
+    icon = soup.select_one('link[rel~="icon"][href]')
+    favicon_url = urljoin(base_url, icon["href"] if icon else "/favicon.ico")
+
+    return {
+        "title": title[:255],
+        "description": description[:500],
+        "favicon_url": favicon_url[:2000],
+    }
+
+
+def fetch_metadata(link, session=None):
+    """
+    Fetches the metadata of the link, or only revalidates it when it was
+    already fetched from the same url.
+    """
+    session = session or requests.Session()
+    metadata = LinkMetadata.objects.filter(link=link).first()
+    if metadata is not None and metadata.url != link.url:
+        metadata.etag = metadata.last_modified = ""
+
+    headers = {"User-Agent": USER_AGENT}
+    if metadata is not None and metadata.etag:
+        headers["If-None-Match"] = metadata.etag
+    if metadata is not None and metadata.last_modified:
+        headers["If-Modified-Since"] = metadata.last_modified
+
+    with session.get(
+        link.url, headers=headers, timeout=FETCH_TIMEOUT, stream=True
+    ) as response:
+        if response.status_code == 304 and metadata is not None:
+            metadata.fetched_at = timezone.now()
+            metadata.save(update_fields=["fetched_at"])
+            return metadata
+
+        response.raise_for_status()
+        fields = {
+            "url": link.url,
+            "etag": response.headers.get("ETag", "")[:255],
+            "last_modified": response.headers.get("Last-Modified", "")[:64],
+            "fetched_at": timezone.now(),
+        }
+        content_type = response.headers.get("Content-Type", "")
+        if "html" in content_type:
+            # Without a charset requests assumes latin-1, the page's own meta
+            # tag is a better guess.
+            encoding = response.encoding if "charset" in content_type else None
+            fields.update(parse_metadata(read_page(response), response.url, encoding))
+
+    metadata, _ = LinkMetadata.objects.update_or_create(link=link, defaults=fields)
+    # The link list shows the metadata.
+    bump_model_generation(Link)
+    return metadata
@@ -0,0 +1,41 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from learou.app.models import AbstractType
+from learou.app.renditions import generate_renditions, missing_renditions
+from learou.app.tasks import generate_icon_renditions
+
+
+class Command(BaseCommand):
+    help = "Creates the missing renditions of every existing icon"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--now",
+            action="store_true",
+            help="Generate the renditions in this process instead of enqueuing them",
+        )
+
+    def icon_names(self):
+        names = set()
+        for model in apps.get_app_config("app").get_models():
+            if issubclass(model, AbstractType):
+                names.update(
+                    model.all_objects.exclude(icon="")
+                    .exclude(icon__isnull=True)
+                    .values_list("icon", flat=True)
+                    .distinct()
+                )
+        return sorted(names)
+
+    def handle(self, *args, **options):
+        pending = [name for name in self.icon_names() if missing_renditions(name)]
+
+        for name in pending:
+            if options["now"]:
+                generate_renditions(name)
+            else:
+                generate_icon_renditions.enqueue(name)
+
+        action = "Generated" if options["now"] else "Enqueued"
+        self.stdout.write(f"{action} the renditions of {len(pending)} icons")
@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from learou.app.linkcheck import LinkChecker
+from learou.app.models import Link
+
+
+class Command(BaseCommand):
+    help = "Checks that the Link urls respond and stores their status"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-hours",
+            type=float,
+            help="Only check the links not checked in this many hours",
+        )
+        parser.add_argument("--workers", type=int, default=32)
+        parser.add_argument(
+            "--per-host",
+            type=int,
+            default=4,
+            help="Concurrent requests allowed to the same host",
+        )
+        parser.add_argument(
+            "--per-host-interval",
+            type=float,
+            default=0.1,
+            help="Minimum seconds between two requests to the same host",
+        )
+        parser.add_argument("--timeout", type=float, default=10)
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        links = Link.objects.all()
+        if options["stale_hours"] is not None:
+            checked_before = timezone.now() - timedelta(hours=options["stale_hours"])
+            links = links.filter(
+                Q(last_checked_at__isnull=True) | Q(last_checked_at__lt=checked_before)
+            )
+
+        checker = LinkChecker(
+            workers=options["workers"],
+            per_host=options["per_host"],
+            per_host_interval=options["per_host_interval"],
+            timeout=options["timeout"],
+        )
+
+        started_at = timezone.now()
+        start = time.perf_counter()
+        total = links.count()
+        checked = 0
+        for checked in checker.check_links(links, chunk_size=options["chunk_size"]):
+            self.stdout.write(f"Checked {checked}/{total} links")
+
+        broken = Link.objects.filter(
+            Q(status_code__isnull=True) | Q(status_code__gte=400),
+            last_checked_at__gte=started_at,
+        ).count()
+        self.stdout.write(
+            f"Checked {checked} links in {time.perf_counter() - start:.1f}s, "
+            f"{broken} are broken"
+        )
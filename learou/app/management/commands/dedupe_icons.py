@@ -0,0 +1,70 @@
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from learou.app.models import AbstractType, StoredBlob
+from learou.app.storage import icon_storage
+
+
+class Command(BaseCommand):
+    help = "Moves the icons uploaded before the content addressed storage into it"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delete-originals",
+            action="store_true",
+            help="Delete the original files once no row references them",
+        )
+
+    def handle(self, *args, **options):
+        storage = icon_storage()
+        models = [
+            model
+            for model in apps.get_app_config("app").get_models()
+            if issubclass(model, AbstractType)
+        ]
+
+        references = Counter()
+        for model in models:
+            references.update(
+                model.all_objects.exclude(icon="")
+                .exclude(icon__isnull=True)
+                .values_list("icon", flat=True)
+            )
+        legacy = {
+            name: count
+            for name, count in references.items()
+            if not storage.is_content_addressed(name)
+        }
+
+        moved = {}
+        for name, count in sorted(legacy.items()):
+            if not storage.exists(name):
+                self.stderr.write(f"Missing file {name}, skipped")
+                continue
+            with storage.open(name) as content:
+                new_name = storage.save(name, content)
+            storage.acquire(new_name, count)
+            moved[name] = new_name
+
+        updated = 0
+        with transaction.atomic():
+            for model in models:
+                rows = list(model.all_objects.filter(icon__in=moved).only("pk", "icon"))
+                for row in rows:
+                    row.icon.name = moved[row.icon.name]
+                model.all_objects.bulk_update(rows, ["icon"], batch_size=500)
+                updated += len(rows)
+
+        if options["delete_originals"]:
+            # The storage only deletes counted files, the originals aren't.
+            for name in moved:
+                FileSystemStorage.delete(storage, name)
+
+        self.stdout.write(
+            f"Moved {len(moved)} files referenced by {updated} rows into "
+            f"{StoredBlob.objects.count()} stored blobs"
+        )
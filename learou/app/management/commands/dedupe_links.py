@@ -0,0 +1,103 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Min
+
+from learou.app.models import AbstractType, Link, bump_model_generation
+
+BATCH_SIZE = 500
+
+
+def link_relations():
+    """
+    Yields the through model of every many to many relation to Link, with the
+    names of its columns for the owner and for the link.
+    """
+    for model in apps.get_models():
+        for field in model._meta.local_many_to_many:
+            if field.related_model is not Link:
+                continue
+            through = field.remote_field.through
+            yield model, through, field.m2m_column_name(), field.m2m_reverse_name()
+
+
+class Command(BaseCommand):
+    help = (
+        "Merges the links to the same resource into the oldest one, moving "
+        "their many to many references to it"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the duplicates",
+        )
+
+    def duplicates(self):
+        """
+        Returns a {duplicate pk: kept pk} dict.
+        """
+        kept_pks = dict(
+            Link.objects.values("url_hash")
+            .annotate(count=Count("pk"), kept_pk=Min("pk"))
+            .filter(count__gt=1)
+            .values_list("url_hash", "kept_pk")
+        )
+        return {
+            pk: kept_pks[url_hash]
+            for pk, url_hash in Link.objects.filter(url_hash__in=kept_pks)
+            .exclude(pk__in=kept_pks.values())
+            .values_list("pk", "url_hash")
+        }
+
+    def move_references(self, model, through, owner_column, link_column, merged):
+        rows = list(
+            through.objects.filter(**{f"{link_column}__in": merged}).values_list(
+                owner_column, link_column
+            )
+        )
+        if not rows:
+            return 0
+
+        # The ignored conflicts are the owners already related to the kept
+        # link, their duplicate reference just goes away.
+        through.objects.bulk_create(
+            [
+                through(**{owner_column: owner, link_column: merged[link]})
+                for owner, link in rows
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        through.objects.filter(**{f"{link_column}__in": merged}).delete()
+
+        if issubclass(model, AbstractType):
+            owners = {owner for owner, _ in rows}
+            model.all_objects.filter(pk__in=owners).update(version=F("version") + 1)
+            bump_model_generation(model)
+        return len(rows)
+
+    def handle(self, *args, **options):
+        merged = self.duplicates()
+        self.stdout.write(
+            f"Found {len(merged)} duplicates of {len(set(merged.values()))} links"
+        )
+        if options["dry_run"] or not merged:
+            return
+
+        with transaction.atomic():
+            for model, through, owner_column, link_column in link_relations():
+                moved = self.move_references(
+                    model, through, owner_column, link_column, merged
+                )
+                if moved:
+                    self.stdout.write(
+                        f"Moved {moved} {model._meta.verbose_name} references"
+                    )
+
+            pks = list(merged)
+            for offset in range(0, len(pks), BATCH_SIZE):
+                Link.objects.filter(pk__in=pks[offset : offset + BATCH_SIZE]).delete()
+
+        self.stdout.write(f"Deleted {len(merged)} duplicate links")
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from learou.app import cascade
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes for good the soft deleted items whose restore window is over, "
+        "in batches"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the deleted rows, restorable and expired",
+        )
+
+    def report(self):
+        for model in cascade.purge_order():
+            deleted = model.all_objects.filter(deleted_at__isnull=False).count()
+            if not deleted:
+                continue
+            expired = cascade.expired_rows(model).count()
+            self.stdout.write(
+                f"{model.__name__}: {deleted} deleted, "
+                f"{expired} past the restore window"
+            )
+
+    def progress(self, model, purged, remaining):
+        self.stdout.write(
+            f"{timezone.now():%H:%M:%S} {model.__name__}: purged {purged}, "
+            f"{remaining} left"
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            self.report()
+            return
+
+        purged, _ = cascade.purge_deleted(
+            batch_size=options["batch_size"], progress=self.progress
+        )
+        self.stdout.write(f"Purged {sum(purged.values())} rows")
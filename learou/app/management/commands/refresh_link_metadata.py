@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from learou.app.models import Link
+from learou.app.tasks import fetch_link_metadata
+
+
+class Command(BaseCommand):
+    help = "Enqueues a refresh of the metadata of the links fetched long ago"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=float,
+            default=7,
+            help="Refresh the metadata fetched before this many days",
+        )
+
+    def handle(self, *args, **options):
+        fetched_before = timezone.now() - timedelta(days=options["older_than_days"])
+        links = Link.objects.filter(
+            Q(metadata__isnull=True) | Q(metadata__fetched_at__lt=fetched_before)
+        ).values_list("pk", flat=True)
+
+        count = 0
+        for count, pk in enumerate(links.iterator(), start=1):
+            fetch_link_metadata.enqueue(pk)
+        self.stdout.write(f"Enqueued the metadata refresh of {count} links")
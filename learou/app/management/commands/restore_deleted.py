@@ -0,0 +1,37 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from learou.app import cascade
+
+
+class Command(BaseCommand):
+    help = (
+        "Restores a soft deleted item and the rows deleted with it, while "
+        "they haven't been purged"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="Model name, such as Project")
+        parser.add_argument("pk", type=int)
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model("app", options["model"])
+        except LookupError:
+            raise CommandError(f"Unknown model {options['model']}")
+        if not cascade.soft_deletable(model):
+            raise CommandError(f"{model.__name__} isn't soft deleted")
+
+        instance = model.all_objects.filter(pk=options["pk"]).first()
+        if instance is None:
+            raise CommandError(f"No {model.__name__} {options['pk']}, it was purged")
+        if instance.deleted_at is None:
+            raise CommandError(f"{instance} isn't deleted")
+
+        try:
+            restored = cascade.restore(instance)
+        except cascade.RestoreError as error:
+            raise CommandError(str(error))
+
+        for restored_model, rows in restored.items():
+            self.stdout.write(f"{restored_model.__name__}: restored {rows}")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from learou.app.stats import rollup_activity
+
+
+class Command(BaseCommand):
+    help = (
+        "Counts the activity of the days since the last run into the daily "
+        "activity table read by the heatmap"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recount every day instead of starting from the last run",
+        )
+
+    def handle(self, *args, **options):
+        rows = rollup_activity(full=options["full"])
+        self.stdout.write(f"Wrote {rows} daily activity rows")
@@ -0,0 +1,84 @@
+import signal
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from learou.app.tasks import schedule_rollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs the database task workers, as many db_worker processes per queue "
+        "as TASK_QUEUE_CONCURRENCY allows, and restarts the ones that exit"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Only run the workers of this queue, can be repeated",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Seconds an idle worker waits before polling its queue again",
+        )
+
+    def worker_command(self, queue, interval):
+        return [
+            sys.executable,
+            "-m",
+            "django",
+            "db_worker",
+            "--queue-name",
+            queue,
+            "--interval",
+            str(interval),
+        ]
+
+    def stop(self, signum, frame):
+        self.running = False
+
+    def handle(self, *args, **options):
+        queues = options["queues"] or settings.TASKS["default"]["QUEUES"]
+        unknown = set(queues) - set(settings.TASKS["default"]["QUEUES"])
+        if unknown:
+            raise CommandError(f"Unknown queues: {', '.join(sorted(unknown))}")
+
+        slots = [
+            queue
+            for queue in queues
+            for _ in range(settings.TASK_QUEUE_CONCURRENCY.get(queue, 1))
+        ]
+        workers = {}
+        if "default" in queues:
+            schedule_rollup()
+
+        self.running = True
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        while self.running:
+            for slot, queue in enumerate(slots):
+                worker = workers.get(slot)
+                if worker is not None and worker.poll() is None:
+                    continue
+                if worker is not None:
+                    self.stderr.write(
+                        f"Worker of {queue} exited with {worker.returncode}, restarting"
+                    )
+                workers[slot] = subprocess.Popen(
+                    self.worker_command(queue, options["interval"])
+                )
+            time.sleep(1)
+
+        # db_worker finishes its current task on SIGTERM.
+        for worker in workers.values():
+            worker.terminate()
+        for worker in workers.values():
+            worker.wait()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+BENCHMARK_ALIAS = "sqlite_benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures SQLite throughput with many readers and one writer on a "
+        "scratch database, using the same OPTIONS as the default database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--duration", type=float, default=5.0)
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument(
+            "--no-tuning",
+            action="store_true",
+            help="Ignore the configured OPTIONS and use the SQLite defaults",
+        )
+
+    def configure_database(self, path, tuned):
+        default = settings.DATABASES["default"]
+        if default["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("The default database is not SQLite")
+
+        connections.settings[BENCHMARK_ALIAS] = {
+            **connections["default"].settings_dict,
+            "NAME": path,
+            "OPTIONS": dict(default.get("OPTIONS", {})) if tuned else {},
+        }
+
+    def create_table(self, rows):
+        with connections[BENCHMARK_ALIAS].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, counter INTEGER)"
+            )
+            cursor.executemany(
+                "INSERT INTO item (name, counter) VALUES (%s, 0)",
+                [(f"item {number}",) for number in range(rows)],
+            )
+        connections[BENCHMARK_ALIAS].close()
+
+    def reader(self, deadline, rows, stats):
+        connection = connections[BENCHMARK_ALIAS]
+        number = 0
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            "SELECT name, counter FROM item WHERE id = %s",
+                            [number % rows + 1],
+                        )
+                        cursor.fetchone()
+                    stats["reads"] += 1
+                except OperationalError:
+                    stats["read_errors"] += 1
+                number += 1
+        finally:
+            connection.close()
+
+    def writer(self, deadline, rows, stats):
+        connection = connections[BENCHMARK_ALIAS]
+        number = 0
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    with transaction.atomic(using=BENCHMARK_ALIAS):
+                        with connection.cursor() as cursor:
+                            cursor.execute(
+                                "UPDATE item SET counter = counter + 1 WHERE id = %s",
+                                [number % rows + 1],
+                            )
+                    stats["writes"] += 1
+                except OperationalError:
+                    stats["write_errors"] += 1
+                number += 1
+        finally:
+            connection.close()
+
+    def handle(self, *args, **options):
+        readers = options["readers"]
+        duration = options["duration"]
+        rows = options["rows"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.configure_database(
+                os.path.join(directory, "benchmark.sqlite3"),
+                tuned=not options["no_tuning"],
+            )
+            self.create_table(rows)
+
+            stats = {"reads": 0, "read_errors": 0, "writes": 0, "write_errors": 0}
+            lock = threading.Lock()
+            deadline = time.monotonic() + duration
+
+            def run(target):
+                local_stats = dict.fromkeys(stats, 0)
+                target(deadline, rows, local_stats)
+                with lock:
+                    for key, value in local_stats.items():
+                        stats[key] += value
+
+            threads = [
+                threading.Thread(target=run, args=(self.reader,))
+                for _ in range(readers)
+            ]
+            threads.append(threading.Thread(target=run, args=(self.writer,)))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.stdout.write(f"Readers: {readers}, writers: 1, duration: {duration}s")
+        self.stdout.write(
+            f"Reads:  {stats['reads'] / duration:10.0f}/s "
+            f"({stats['read_errors']} errors)"
+        )
+        self.stdout.write(
+            f"Writes: {stats['writes'] / duration:10.0f}/s "
+            f"({stats['write_errors']} errors)"
+        )
@@ -0,0 +1,81 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter, so the measure covers the whole boot of a worker:
+# settings, apps, models and the URLconf.
+BOOT_SCRIPT = """
+import json, resource, time
+
+start = time.perf_counter()
+
+import django
+
+django.setup()
+
+from django.urls import get_resolver
+
+get_resolver().url_patterns
+
+boot = time.perf_counter() - start
+
+try:
+    # ru_maxrss survives exec, so it would include the parent process.
+    with open("/proc/self/status") as status:
+        rss = next(int(line.split()[1]) for line in status if line.startswith("VmRSS"))
+except OSError:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({"boot": boot, "rss": rss}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the boot time and memory of a worker for each settings "
+        "module, for example to compare the full and the slim API profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "settings_modules",
+            nargs="*",
+            help="Settings modules to compare (default: the current one and "
+            "learou.settings.api)",
+        )
+        parser.add_argument("--runs", type=int, default=5)
+
+    def measure(self, settings_module):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings_module,
+            "LEAROU_STARTUP_PROFILE": "",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", BOOT_SCRIPT],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"{settings_module} failed to boot:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        settings_modules = options["settings_modules"] or [
+            settings.SETTINGS_MODULE,
+            "learou.settings.api",
+        ]
+
+        self.stdout.write(f"{'Settings':<30} {'Boot (ms)':>10} {'RSS (MiB)':>10}")
+        for settings_module in settings_modules:
+            runs = [self.measure(settings_module) for _ in range(options["runs"])]
+            boot = statistics.median(run["boot"] for run in runs) * 1000
+            # Both VmRSS and ru_maxrss are reported in KiB on Linux.
+            rss = statistics.median(run["rss"] for run in runs) / 1024
+            self.stdout.write(f"{settings_module:<30} {boot:>10.1f} {rss:>10.1f}")
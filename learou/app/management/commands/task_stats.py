@@ -0,0 +1,97 @@
+import statistics
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Min, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django_tasks import DEFAULT_TASK_BACKEND_ALIAS, tasks
+from django_tasks.backends.database.backend import DatabaseBackend
+from django_tasks.backends.database.models import DBTaskResult
+from django_tasks.task import ResultStatus
+
+from learou.app.tasks import ready_at
+
+
+def percentiles(values):
+    if not values:
+        return "-"
+    if len(values) == 1:
+        return f"{values[0]:.1f}s"
+    quantiles = statistics.quantiles(values, n=20)
+    return f"{statistics.median(values):.1f}s / {quantiles[-1]:.1f}s"
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows the depth of every task queue and the wait and run times, median "
+        "and 95th percentile, of the tasks finished recently"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            default=60,
+            help="Finished tasks taken into account (default: the last 60 minutes)",
+        )
+
+    def handle(self, *args, **options):
+        backend = tasks[DEFAULT_TASK_BACKEND_ALIAS]
+        if not isinstance(backend, DatabaseBackend):
+            raise CommandError("The task backend doesn't store the tasks")
+
+        now = timezone.now()
+        since = now - timedelta(minutes=options["minutes"])
+        results = DBTaskResult.objects.filter(backend_name=backend.alias)
+
+        queues = {
+            row["queue_name"]: row
+            for row in results.values("queue_name").annotate(
+                running=Count("pk", filter=Q(status=ResultStatus.RUNNING)),
+                failed=Count(
+                    "pk",
+                    filter=Q(status=ResultStatus.FAILED, finished_at__gte=since),
+                ),
+            )
+        }
+        # The deferred tasks only count once their run_after has passed.
+        for row in (
+            results.ready()
+            .values("queue_name")
+            .annotate(
+                ready=Count("pk"),
+                oldest_ready=Min(
+                    Greatest("enqueued_at", Coalesce("run_after", "enqueued_at"))
+                ),
+            )
+        ):
+            queues.setdefault(row["queue_name"], {}).update(row)
+
+        wait_times = {}
+        run_times = {}
+        finished = results.filter(finished_at__gte=since, started_at__isnull=False)
+        for row in finished.values(
+            "queue_name", "enqueued_at", "run_after", "started_at", "finished_at"
+        ):
+            queue = row["queue_name"]
+            ready = ready_at(row["enqueued_at"], row["run_after"])
+            wait = (row["started_at"] - ready).total_seconds()
+            wait_times.setdefault(queue, []).append(wait)
+            run = (row["finished_at"] - row["started_at"]).total_seconds()
+            run_times.setdefault(queue, []).append(run)
+
+        self.stdout.write(
+            f"{'Queue':<12} {'Ready':>6} {'Oldest':>8} {'Running':>8} "
+            f"{'Failed':>7} {'Wait p50 / p95':>18} {'Run p50 / p95':>18}"
+        )
+        for queue in sorted(set(queues) | set(wait_times)):
+            row = queues.get(queue, {})
+            oldest = row.get("oldest_ready")
+            oldest = f"{(now - oldest).total_seconds():.0f}s" if oldest else "-"
+            self.stdout.write(
+                f"{queue:<12} {row.get('ready', 0):>6} {oldest:>8} "
+                f"{row.get('running', 0):>8} {row.get('failed', 0):>7} "
+                f"{percentiles(wait_times.get(queue, [])):>18} "
+                f"{percentiles(run_times.get(queue, [])):>18}"
+            )
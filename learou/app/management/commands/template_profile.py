@@ -0,0 +1,82 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+from django.test import RequestFactory
+
+from learou.app import models
+from learou.app.renditions import RenditionMap
+from learou.app.warmup import view_templates
+
+
+def sample_task():
+    status = models.TaskStatus(pk=1, name="In progress")
+    task_type = models.TaskType(pk=1, name="Feature")
+    return models.Task(
+        pk=1,
+        name="Sample task",
+        description="A task used to profile the templates",
+        status=status,
+        task_type=task_type,
+    )
+
+
+def sample_context():
+    task = sample_task()
+    objects = [task] * 20
+    return {
+        "object": task,
+        "objects": objects,
+        "icon_renditions": RenditionMap(objects),
+        "model_name": "Task",
+        "model_fields": {"Status": task.status, "Type": task.task_type},
+        "list_url": "task_list",
+        "update_url": "task_update",
+        "detail_url": "task_detail",
+        "create_url": "task_create",
+        "delete_url": "task_delete",
+    }
+
+
+# Context the including template passes with {% include ... with ... %}.
+INCLUDE_CONTEXTS = {
+    "app/partials/base_breadcrumb.html": {
+        "breadcrumb_url": "task_detail",
+        "breadcrumb_url_parameter": 1,
+        "breadcrumb_name": "Sample task",
+        "icon": "cube",
+    },
+}
+
+
+class Command(BaseCommand):
+    help = "Measures the render time of every template used by the generic views"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+
+        results = []
+        for template_name in sorted(view_templates()):
+            template = get_template(template_name)
+            context = {**sample_context(), **INCLUDE_CONTEXTS.get(template_name, {})}
+            # The first render fills the caches of the template tags.
+            template.render(context, request)
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                template.render(context, request)
+            results.append(
+                (template_name, (time.perf_counter() - start) / iterations * 1e6)
+            )
+
+        self.stdout.write(f"{'Template':<45} {'µs/render':>10}")
+        for template_name, duration in sorted(
+            results, key=lambda result: result[1], reverse=True
+        ):
+            self.stdout.write(f"{template_name:<45} {duration:>10.1f}")
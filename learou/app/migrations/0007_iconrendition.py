@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_project_parent_milestone'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='custommodelname',
+            name='model',
+            field=models.CharField(choices=[('AbstractType', 'Abstract Type'), ('TaskType', 'Task Type'), ('TaskStatus', 'Task Status'), ('Task', 'Task'), ('LinkType', 'Link Type'), ('Link', 'Link'), ('Review', 'Review'), ('Author', 'Author'), ('BibliographyType', 'Bibliography Type'), ('Bibliography', 'Bibliography'), ('CheatSheet', 'Cheat Sheet'), ('Technology', 'Technology'), ('ProjectType', 'Project Type'), ('ProjectStatus', 'Project Status'), ('Project', 'Project'), ('Diary', 'Diary'), ('DiaryEntry', 'Diary Entry'), ('CustomModelNameCollection', 'Custom Model Name Collection'), ('CustomModelName', 'Custom Model Name'), ('Milestone', 'Milestone')], verbose_name='Model'),
+        ),
+        migrations.CreateModel(
+            name='IconRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(db_index=True, max_length=255, verbose_name='Source')),
+                ('format', models.CharField(choices=[('avif', 'AVIF'), ('webp', 'WebP')], max_length=4, verbose_name='Format')),
+                ('size', models.PositiveSmallIntegerField(verbose_name='Size')),
+                ('file', models.ImageField(upload_to='renditions/', verbose_name='File')),
+                ('width', models.PositiveIntegerField(verbose_name='Width')),
+                ('height', models.PositiveIntegerField(verbose_name='Height')),
+            ],
+            options={
+                'unique_together': {('source', 'format', 'size')},
+            },
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:55
+
+import learou.app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_iconrendition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='Name')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Size')),
+                ('references', models.PositiveIntegerField(default=0, verbose_name='References')),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='author',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='bibliography',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='bibliographytype',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='cheatsheet',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='custommodelname',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='custommodelnamecollection',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='diary',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='diaryentry',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='link',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='linktype',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='milestone',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='projectstatus',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='projecttype',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='taskstatus',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='tasktype',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='technology',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, storage=learou.app.storage.icon_storage, upload_to='', verbose_name='Image'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_storedblob_icon_storage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='diary',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+        migrations.AlterField(
+            model_name='diaryentry',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+        ),
+    ]
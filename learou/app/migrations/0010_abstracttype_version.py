@@ -0,0 +1,108 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_updated_at_datetime'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='bibliography',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='bibliographytype',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='cheatsheet',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='custommodelname',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='custommodelnamecollection',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='diary',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='diaryentry',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='linktype',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='milestone',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='projectstatus',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='projecttype',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='taskstatus',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='tasktype',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+        migrations.AddField(
+            model_name='technology',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Version'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_abstracttype_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='link',
+            name='check_error',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Check error'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='final_url',
+            field=models.URLField(blank=True, editable=False, max_length=2000, verbose_name='Final URL'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='last_checked_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Last checked at'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='latency',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Latency'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Status code'),
+        ),
+    ]
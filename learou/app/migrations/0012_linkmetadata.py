@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_link_check'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LinkMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=2000, verbose_name='URL')),
+                ('title', models.CharField(blank=True, max_length=255, verbose_name='Title')),
+                ('description', models.CharField(blank=True, max_length=500, verbose_name='Description')),
+                ('favicon_url', models.URLField(blank=True, max_length=2000, verbose_name='Favicon URL')),
+                ('etag', models.CharField(blank=True, max_length=255, verbose_name='ETag')),
+                ('last_modified', models.CharField(blank=True, max_length=64, verbose_name='Last modified')),
+                ('fetched_at', models.DateTimeField(verbose_name='Fetched at')),
+                ('link', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='metadata', to='app.link', verbose_name='Link')),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_linkmetadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='link',
+            name='normalized_url',
+            field=models.URLField(blank=True, editable=False, max_length=2000, verbose_name='Normalized URL'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='url_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='URL hash'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:08
+
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.db import migrations
+
+# Copied from learou.app.models as they were when this migration was written,
+# so later changes to the normalization don't change what it fills in.
+TRACKING_PARAMETERS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid"}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    userinfo, at, hostport = parts.netloc.rpartition("@")
+    netloc = (parts.hostname or "").lower()
+    if ":" in netloc:
+        netloc = f"[{netloc}]"
+    try:
+        port = parts.port
+    except ValueError:
+        # URLValidator accepts ports urllib refuses, like 99999.
+        port = hostport.rpartition(":")[2]
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    if at:
+        netloc = f"{userinfo}@{netloc}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMETERS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    if scheme in DEFAULT_PORTS:
+        scheme = "https"
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def url_hash(url):
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+def fill_url_hash(apps, schema_editor):
+    Link = apps.get_model("app", "Link")
+    links = list(Link.objects.only("pk", "url"))
+    for link in links:
+        link.normalized_url = normalize_url(link.url)
+        link.url_hash = url_hash(link.url)
+    Link.objects.bulk_update(links, ["normalized_url", "url_hash"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_link_normalized_url'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_url_hash, migrations.RunPython.noop),
+    ]
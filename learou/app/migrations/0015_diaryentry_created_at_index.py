@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0014_fill_link_url_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='diaryentry',
+            index=models.Index(fields=['created_at', 'id'], name='diaryentry_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0015_diaryentry_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True, verbose_name='Name')),
+                ('date', models.DateField(verbose_name='Date')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Completed at'),
+        ),
+        # Added without the default first, which would stamp the existing
+        # tasks with the time of the migration.
+        migrations.AddField(
+            model_name='task',
+            name='created_at',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Created at'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, null=True, verbose_name='Created at'),
+        ),
+        migrations.AddField(
+            model_name='taskstatus',
+            name='is_done',
+            field=models.BooleanField(default=False, help_text='Tasks moved to this status count as completed', verbose_name='Is done'),
+        ),
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('kind', models.CharField(choices=[('entry', 'Diary entries'), ('review', 'Reviews'), ('task_created', 'Tasks created'), ('task_completed', 'Tasks completed')], max_length=16, verbose_name='Kind')),
+                ('scope', models.CharField(choices=[('all', 'All'), ('project', 'Project'), ('technology', 'Technology')], max_length=16, verbose_name='Scope')),
+                ('scope_id', models.PositiveIntegerField(default=0, verbose_name='Scope id')),
+                ('count', models.PositiveIntegerField(verbose_name='Count')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('scope', 'scope_id', 'date', 'kind'), name='unique_daily_activity')],
+            },
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0016_activity_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='bibliography',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='bibliographytype',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='cheatsheet',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='custommodelname',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='custommodelnamecollection',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='diary',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='diaryentry',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='link',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='linktype',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='milestone',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='projectstatus',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='projecttype',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='taskstatus',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='tasktype',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='technology',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+    ]
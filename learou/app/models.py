@@ -1,7 +1,146 @@
+import hashlib
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.db.models import UniqueConstraint, Q
 
+from learou.app.storage import icon_storage
+
+CUSTOM_MODEL_NAMES_CACHE_KEY = "learou:custom_model_names"
+
+
+def custom_model_names():
+    """
+    Returns the custom names of the active collection as a {model: name} dict.
+
+    The map is cached, and the cache is cleared whenever a custom name or a
+    collection changes. With a per-process cache (the default LocMemCache)
+    other processes see the change after CUSTOM_MODEL_NAMES_CACHE_TIMEOUT.
+    """
+    model_names = cache.get(CUSTOM_MODEL_NAMES_CACHE_KEY)
+    if model_names is None:
+        model_names = dict(
+            CustomModelName.objects.filter(
+                custom_model_name_collection__is_active=True
+            ).values_list("model", "name")
+        )
+        cache.set(
+            CUSTOM_MODEL_NAMES_CACHE_KEY,
+            model_names,
+            settings.CUSTOM_MODEL_NAMES_CACHE_TIMEOUT,
+        )
+    return model_names
+
+
+def model_generation_key(model):
+    return f"learou:generation:{model._meta.label_lower}"
+
+
+def model_generation(model):
+    """
+    Returns a counter that changes whenever an object of the model is saved,
+    deleted or has its many to many relations changed, see
+    learou.app.signals. Validating a cached list against it is O(1).
+
+    The counter starts from the current time, so a counter lost with the
+    cache never repeats a value already handed out. Returns None with a per
+    process cache, where the other processes wouldn't see the changes.
+    """
+    if isinstance(caches["default"], LocMemCache):
+        return None
+
+    key = model_generation_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        generation = time.time_ns()
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def bump_model_generation(model):
+    key = model_generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+class VersionConflict(Exception):
+    """
+    Raised when a versioned save finds the object changed since it was read.
+    """
+
+    def __init__(self, instance, expected_version):
+        self.instance = instance
+        self.expected_version = expected_version
+        super().__init__(
+            f"{instance._meta.verbose_name} {instance.pk} changed since "
+            f"version {expected_version}"
+        )
+
+
+# Query parameters that only track where a visitor came from.
+TRACKING_PARAMETERS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid"}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """
+    Returns the url without what doesn't change the resource: the scheme (http
+    and https are considered the same), the case of the host, default ports,
+    trailing slashes, tracking parameters, the order of the parameters and
+    the fragment.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    userinfo, at, hostport = parts.netloc.rpartition("@")
+    netloc = (parts.hostname or "").lower()
+    if ":" in netloc:
+        netloc = f"[{netloc}]"
+    try:
+        port = parts.port
+    except ValueError:
+        # URLValidator accepts ports urllib refuses, like 99999.
+        port = hostport.rpartition(":")[2]
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{port}"
+    if at:
+        netloc = f"{userinfo}@{netloc}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMETERS
+        and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip("/") or "/"
+    if scheme in DEFAULT_PORTS:
+        scheme = "https"
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+def url_hash(url):
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+class ActiveManager(models.Manager):
+    """
+    Leaves out the soft deleted rows, see learou.app.cascade.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 
 class AbstractType(models.Model):
     """
@@ -16,30 +155,83 @@ class AbstractType(models.Model):
         verbose_name=_("Name"), max_length=255, blank=False, unique=True
     )
     description = models.TextField(verbose_name=_("Description"), blank=True, null=True)
-    icon = models.ImageField(verbose_name=_("Image"), blank=True, null=True)
+    icon = models.ImageField(
+        verbose_name=_("Image"), blank=True, null=True, storage=icon_storage
+    )
+    # Bumped on every save and many to many change, caches and ETags compare
+    # it instead of the whole object.
+    version = models.PositiveIntegerField(
+        verbose_name=_("Version"), default=0, editable=False
+    )
+    # Soft deleted rows stay hidden until the purge removes them.
+    deleted_at = models.DateTimeField(
+        verbose_name=_("Deleted at"),
+        blank=True,
+        null=True,
+        editable=False,
+        db_index=True,
+    )
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return str(self.name)
 
-    @classmethod
-    def model_name(cls):
-        from learou.app.models import CustomModelNameCollection, CustomModelName
-
-        custom_collection_qs = CustomModelNameCollection.objects.filter(is_active=True)
-
-        if not custom_collection_qs:
-            return cls.__name__
-
-        custom_collection = custom_collection_qs.first()
-
-        custom_model_name_qs = CustomModelName.objects.filter(
-            model=cls.__name__, custom_model_name_collection=custom_collection
+    def save(self, *args, expected_version=None, **kwargs):
+        """
+        With expected_version, the UPDATE only matches the row while it still
+        has that version, and VersionConflict is raised if it doesn't. The
+        check and the write are the same query, no row is locked.
+        """
+        self.version += 1
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+
+        self._expected_version = expected_version
+        try:
+            super().save(*args, **kwargs)
+        except VersionConflict:
+            self.version -= 1
+            raise
+        finally:
+            self._expected_version = None
+
+    def validate_unique(self, exclude=None):
+        super().validate_unique(exclude=exclude)
+        # The default manager doesn't see the deleted rows, but they keep
+        # their name until they are purged.
+        if exclude and "name" in exclude:
+            return
+        deleted = (
+            type(self)
+            .all_objects.filter(name=self.name, deleted_at__isnull=False)
+            .exclude(pk=self.pk)
         )
+        if deleted.exists():
+            raise ValidationError(
+                {"name": _("A deleted item waiting to be purged has this name.")}
+            )
 
-        if not custom_model_name_qs:
-            return cls.__name__
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected_version = getattr(self, "_expected_version", None)
+        if expected_version is None:
+            return super()._do_update(
+                base_qs, using, pk_val, values, update_fields, forced_update
+            )
+
+        # Without a matching row Django would try an INSERT next.
+        base_qs = base_qs.filter(version=expected_version)
+        if not super()._do_update(
+            base_qs, using, pk_val, values, update_fields, forced_update=True
+        ):
+            raise VersionConflict(self, expected_version)
+        return True
 
-        return custom_model_name_qs.first().name
+    @classmethod
+    def model_name(cls):
+        return custom_model_names().get(cls.__name__, cls.__name__)
 
 
 class TaskType(AbstractType):
@@ -55,7 +247,11 @@ class TaskStatus(AbstractType):
     Tracks the different task status such as in progress, done, etc.
     """
 
-    ...
+    is_done = models.BooleanField(
+        verbose_name=_("Is done"),
+        default=False,
+        help_text=_("Tasks moved to this status count as completed"),
+    )
 
 
 class Task(AbstractType):
@@ -79,10 +275,32 @@ class Task(AbstractType):
         null=False,
         on_delete=models.CASCADE,
     )
+    # Empty for the tasks created before it was recorded.
+    created_at = models.DateTimeField(
+        verbose_name=_("Created at"), default=timezone.now, null=True, editable=False
+    )
+    completed_at = models.DateTimeField(
+        verbose_name=_("Completed at"), blank=True, null=True, editable=False
+    )
 
     def __str__(self):
         return str(self.name)
 
+    def set_completion(self, is_done, now=None):
+        # Completed when it reaches a done status, reopened when it leaves it.
+        if is_done and self.completed_at is None:
+            self.completed_at = now or timezone.now()
+        elif not is_done:
+            self.completed_at = None
+
+    def save(self, *args, **kwargs):
+        self.set_completion(self.status_id is not None and self.status.is_done)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "completed_at"}
+        super().save(*args, **kwargs)
+
 
 class LinkType(AbstractType):
     """
@@ -98,10 +316,53 @@ class Link(AbstractType):
     """
 
     url = models.URLField(verbose_name=_("Link"), blank=False, unique=False)
+    # Same value for the urls of the same resource, see normalize_url. The
+    # hash keeps the index small whatever the length of the url.
+    normalized_url = models.URLField(
+        verbose_name=_("Normalized URL"), max_length=2000, blank=True, editable=False
+    )
+    url_hash = models.CharField(
+        verbose_name=_("URL hash"),
+        max_length=64,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    # Filled by the link checker, see learou.app.linkcheck.
+    status_code = models.PositiveSmallIntegerField(
+        verbose_name=_("Status code"), blank=True, null=True, editable=False
+    )
+    final_url = models.URLField(
+        verbose_name=_("Final URL"), max_length=2000, blank=True, editable=False
+    )
+    latency = models.FloatField(
+        verbose_name=_("Latency"), blank=True, null=True, editable=False
+    )
+    check_error = models.CharField(
+        verbose_name=_("Check error"), max_length=255, blank=True, editable=False
+    )
+    last_checked_at = models.DateTimeField(
+        verbose_name=_("Last checked at"), blank=True, null=True, editable=False
+    )
 
     def __str__(self):
         return str(self.name)
 
+    def save(self, *args, **kwargs):
+        self.normalized_url = normalize_url(self.url)
+        self.url_hash = url_hash(self.url)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "url" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "normalized_url", "url_hash"}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def saved(cls, url):
+        """
+        Returns the links to the same resource as the url, using the index.
+        """
+        return cls.objects.filter(url_hash=url_hash(url))
+
 
 class Review(AbstractType):
     """
@@ -230,7 +491,7 @@ class Project(AbstractType):
     )
     tasks = models.ManyToManyField(Task, verbose_name=_("Task"), blank=True)
     created_at = models.DateField(verbose_name=_("Created at"), auto_now_add=True)
-    updated_at = models.DateField(verbose_name=_("Updated at"), auto_now=True)
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
     parent = models.ForeignKey(
         "self",
         on_delete=models.CASCADE,
@@ -249,18 +510,27 @@ class Project(AbstractType):
 
     @property
     def subprojects_tasks(self):
-        return Task.objects.filter(projects_set__parent=self).distinct()
+        return Task.objects.filter(
+            project__parent=self, project__deleted_at__isnull=True
+        ).distinct()
 
     @property
     def milestones_tasks(self):
-        return Task.objects.filter(milestones_set__project=self).distinct()
+        return Task.objects.filter(
+            milestone__project=self, milestone__deleted_at__isnull=True
+        ).distinct()
 
     @property
     def all_tasks(self):
-        project_tasks = self.project_tasks
-        subprojects_tasks = self.subprojects_tasks
-        milestones_tasks = self.milestones_tasks
-        return project_tasks.union(subprojects_tasks).union(milestones_tasks).distinct()
+        # One filter instead of a union, so the result can still be filtered,
+        # annotated and joined. The joins don't go through the default
+        # manager, the soft deleted subprojects and milestones are left out
+        # by hand.
+        return Task.objects.filter(
+            Q(project=self)
+            | Q(project__parent=self, project__deleted_at__isnull=True)
+            | Q(milestone__project=self, milestone__deleted_at__isnull=True)
+        ).distinct()
 
 
 class Milestone(AbstractType):
@@ -298,7 +568,7 @@ class Diary(AbstractType):
     tasks = models.ManyToManyField(Task, verbose_name=_("Task"), blank=True)
     project = models.ManyToManyField(Project, verbose_name=_("Project"), blank=True)
     created_at = models.DateField(verbose_name=_("Created at"), auto_now_add=True)
-    updated_at = models.DateField(verbose_name=_("Updated at"), auto_now=True)
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
 
     def __str__(self):
         return str(self.name)
@@ -322,7 +592,13 @@ class DiaryEntry(AbstractType):
     tasks = models.ManyToManyField(Task, verbose_name=_("Task"), blank=True)
     project = models.ManyToManyField(Project, verbose_name=_("Project"), blank=True)
     created_at = models.DateField(verbose_name=_("Created at"), auto_now_add=True)
-    updated_at = models.DateField(verbose_name=_("Updated at"), auto_now=True)
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
+
+    class Meta:
+        # The diary timeline filters, buckets and paginates by date.
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="diaryentry_created_at_idx")
+        ]
 
     def __str__(self):
         return str(self.name)
@@ -382,3 +658,122 @@ class CustomModelName(AbstractType):
 
     def __str__(self):
         return f"{self.custom_model_name_collection.name} - {self.model}"
+
+
+class IconRendition(models.Model):
+    """
+    Resized copy of an AbstractType icon, so list pages don't download the
+    original image.
+    """
+
+    FORMATS = (
+        ("avif", "AVIF"),
+        ("webp", "WebP"),
+    )
+    source = models.CharField(verbose_name=_("Source"), max_length=255, db_index=True)
+    format = models.CharField(verbose_name=_("Format"), max_length=4, choices=FORMATS)
+    size = models.PositiveSmallIntegerField(verbose_name=_("Size"))
+    file = models.ImageField(verbose_name=_("File"), upload_to="renditions/")
+    width = models.PositiveIntegerField(verbose_name=_("Width"))
+    height = models.PositiveIntegerField(verbose_name=_("Height"))
+
+    class Meta:
+        unique_together = ("source", "format", "size")
+
+    def __str__(self):
+        return f"{self.source} ({self.format}, {self.size}px)"
+
+
+class StoredBlob(models.Model):
+    """
+    Counts the icons referencing each file of the content addressed storage.
+    """
+
+    name = models.CharField(verbose_name=_("Name"), max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(verbose_name=_("Size"))
+    references = models.PositiveIntegerField(verbose_name=_("References"), default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.references})"
+
+
+class LinkMetadata(models.Model):
+    """
+    Title, description and favicon of the page behind a Link, fetched in the
+    background, see learou.app.linkmeta. The validators of the last response
+    let the refreshes of unchanged pages end with a 304.
+    """
+
+    link = models.OneToOneField(
+        Link,
+        on_delete=models.CASCADE,
+        related_name="metadata",
+        verbose_name=_("Link"),
+    )
+    # The url the metadata was fetched from, the link may have changed since.
+    url = models.URLField(verbose_name=_("URL"), max_length=2000)
+    title = models.CharField(verbose_name=_("Title"), max_length=255, blank=True)
+    description = models.CharField(
+        verbose_name=_("Description"), max_length=500, blank=True
+    )
+    favicon_url = models.URLField(
+        verbose_name=_("Favicon URL"), max_length=2000, blank=True
+    )
+    etag = models.CharField(verbose_name=_("ETag"), max_length=255, blank=True)
+    last_modified = models.CharField(
+        verbose_name=_("Last modified"), max_length=64, blank=True
+    )
+    fetched_at = models.DateTimeField(verbose_name=_("Fetched at"))
+
+    def __str__(self):
+        return self.title or self.url
+
+
+class DailyActivity(models.Model):
+    """
+    Number of diary entries, reviews and created or completed tasks per day,
+    overall and per project or technology. Written by the activity rollup,
+    see learou.app.stats, so the heatmap reads it instead of counting.
+    """
+
+    KINDS = (
+        ("entry", _("Diary entries")),
+        ("review", _("Reviews")),
+        ("task_created", _("Tasks created")),
+        ("task_completed", _("Tasks completed")),
+    )
+    SCOPES = (
+        ("all", _("All")),
+        ("project", _("Project")),
+        ("technology", _("Technology")),
+    )
+
+    date = models.DateField(verbose_name=_("Date"))
+    kind = models.CharField(verbose_name=_("Kind"), max_length=16, choices=KINDS)
+    scope = models.CharField(verbose_name=_("Scope"), max_length=16, choices=SCOPES)
+    # Project or technology pk, 0 for the "all" scope.
+    scope_id = models.PositiveIntegerField(verbose_name=_("Scope id"), default=0)
+    count = models.PositiveIntegerField(verbose_name=_("Count"))
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["scope", "scope_id", "date", "kind"],
+                name="unique_daily_activity",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.kind} {self.scope}:{self.scope_id} ({self.count})"
+
+
+class RollupWatermark(models.Model):
+    """
+    Last day a rollup has processed, the next run starts from it.
+    """
+
+    name = models.CharField(verbose_name=_("Name"), max_length=64, unique=True)
+    date = models.DateField(verbose_name=_("Date"))
+
+    def __str__(self):
+        return f"{self.name}: {self.date}"
@@ -0,0 +1,121 @@
+"""
+Fixed size AVIF and WebP thumbnails of the AbstractType icons.
+
+Renditions are keyed by the name of the icon file. Stored file names never
+change, a new upload gets a new name, so a rendition is never stale.
+"""
+
+import os
+from io import BytesIO
+
+import pillow_heif
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.utils.functional import cached_property
+from PIL import Image, ImageOps
+
+from learou.app.models import AbstractType, IconRendition, bump_model_generation
+from learou.app.storage import icon_storage
+
+pillow_heif.register_avif_opener()
+
+# Square box, in pixels, each rendition fits in. The larger one serves high
+# density screens.
+RENDITION_SIZES = (64, 128)
+
+RENDITION_FORMATS = {
+    "avif": {"format": "AVIF", "quality": 60},
+    "webp": {"format": "WEBP", "quality": 80},
+}
+
+
+def missing_renditions(source):
+    existing = set(
+        IconRendition.objects.filter(source=source).values_list("format", "size")
+    )
+    return [
+        (file_format, size)
+        for file_format in RENDITION_FORMATS
+        for size in RENDITION_SIZES
+        if (file_format, size) not in existing
+    ]
+
+
+def generate_renditions(source, storage=None):
+    """
+    Creates the missing renditions of the icon stored as ``source``.
+    """
+    storage = storage or icon_storage()
+    missing = missing_renditions(source)
+    if not missing:
+        return 0
+
+    with storage.open(source, "rb") as source_file:
+        image = Image.open(source_file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    stem = os.path.splitext(os.path.basename(source))[0]
+    for file_format, size in missing:
+        thumbnail = ImageOps.contain(image, (size, size), Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        thumbnail.save(buffer, **RENDITION_FORMATS[file_format])
+
+        rendition = IconRendition(
+            source=source,
+            format=file_format,
+            size=size,
+            width=thumbnail.width,
+            height=thumbnail.height,
+        )
+        rendition.file.save(
+            f"{stem}-{size}.{file_format}", ContentFile(buffer.getvalue()), save=False
+        )
+        rendition.save()
+
+    bump_icon_generations(source)
+    return len(missing)
+
+
+def bump_icon_generations(source):
+    """
+    Bumps the generation of the models using the icon, their lists show its
+    renditions.
+    """
+    for model in apps.get_app_config("app").get_models():
+        if (
+            issubclass(model, AbstractType)
+            and model.all_objects.filter(icon=source).exists()
+        ):
+            bump_model_generation(model)
+
+
+class RenditionMap:
+    """
+    Renditions of the icons of a page worth of objects, fetched in one query
+    the first time the template asks for one.
+    """
+
+    def __init__(self, objects):
+        # Only iterated on the first lookup, so a list answered with a 304
+        # isn't fetched for its icons.
+        self.objects = objects
+
+    @cached_property
+    def by_source(self):
+        renditions = {}
+        sources = {obj.icon.name for obj in self.objects if obj.icon}
+        if not sources:
+            return renditions
+
+        for rendition in IconRendition.objects.filter(source__in=sources).order_by(
+            "format", "size"
+        ):
+            renditions.setdefault(rendition.source, []).append(rendition)
+        return renditions
+
+    def get(self, source):
+        return self.by_source.get(source, [])
@@ -0,0 +1,146 @@
+import logging
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.dispatch import receiver
+from django_tasks.signals import task_finished
+
+from learou.app.models import (
+    CUSTOM_MODEL_NAMES_CACHE_KEY,
+    AbstractType,
+    CustomModelName,
+    CustomModelNameCollection,
+    Link,
+    LinkMetadata,
+    bump_model_generation,
+)
+from learou.app.renditions import missing_renditions
+from learou.app.storage import icon_storage
+from learou.app.tasks import fetch_link_metadata, generate_icon_renditions, ready_at
+
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=CustomModelName)
+@receiver(post_delete, sender=CustomModelName)
+@receiver(post_save, sender=CustomModelNameCollection)
+@receiver(post_delete, sender=CustomModelNameCollection)
+def clear_custom_model_names(sender, **kwargs):
+    cache.delete(CUSTOM_MODEL_NAMES_CACHE_KEY)
+
+
+@receiver(task_finished)
+def log_task_timing(sender, task_result, **kwargs):
+    if not (task_result.enqueued_at and task_result.started_at):
+        return
+    logger.info(
+        "Task %s on %s %s, waited %.2fs, ran %.2fs",
+        task_result.task.name,
+        task_result.task.queue_name,
+        task_result.status,
+        (
+            task_result.started_at
+            - ready_at(task_result.enqueued_at, task_result.task.run_after)
+        ).total_seconds(),
+        (task_result.finished_at - task_result.started_at).total_seconds(),
+    )
+
+
+@receiver(post_save, sender=Link)
+def enqueue_link_metadata(sender, instance, created, **kwargs):
+    if (
+        created
+        or not LinkMetadata.objects.filter(link=instance, url=instance.url).exists()
+    ):
+        fetch_link_metadata.enqueue(instance.pk)
+
+
+def enqueue_icon_renditions(sender, instance, **kwargs):
+    if instance.icon and missing_renditions(instance.icon.name):
+        generate_icon_renditions.enqueue(instance.icon.name)
+
+
+def remember_icon(sender, instance, **kwargs):
+    # Read the raw value, going through the descriptor would load a deferred
+    # icon. Instances loaded without it aren't tracked.
+    if "icon" in instance.__dict__:
+        icon = instance.__dict__["icon"]
+        instance._loaded_icon = getattr(icon, "name", icon)
+
+
+def swap_icon_reference(sender, instance, **kwargs):
+    if not hasattr(instance, "_loaded_icon"):
+        return
+
+    loaded_icon = instance._loaded_icon
+    if loaded_icon != instance.icon.name:
+        if instance.icon:
+            icon_storage().acquire(instance.icon.name)
+        if loaded_icon:
+            transaction.on_commit(lambda: icon_storage().delete(loaded_icon))
+    instance._loaded_icon = instance.icon.name
+
+
+def release_deleted_icon(sender, instance, **kwargs):
+    if instance.icon:
+        transaction.on_commit(lambda: icon_storage().delete(instance.icon.name))
+
+
+def bump_generation(sender, **kwargs):
+    bump_model_generation(sender)
+
+
+def bump_versions(model, pks):
+    if not pks or not issubclass(model, AbstractType):
+        return
+    model.all_objects.filter(pk__in=pks).update(version=F("version") + 1)
+    bump_model_generation(model)
+
+
+def related_pks(through, instance, model):
+    foreign_keys = [field for field in through._meta.fields if field.many_to_one]
+    source = next(f for f in foreign_keys if f.related_model is type(instance))
+    target = next(
+        f for f in foreign_keys if f.related_model is model and f is not source
+    )
+    return set(
+        through.objects.filter(**{source.name: instance.pk}).values_list(
+            target.attname, flat=True
+        )
+    )
+
+
+def bump_related_versions(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    A relation belongs to both sides, so both get a new version. The ids a
+    clear removes are only known before it runs.
+    """
+    if action == "pre_clear":
+        instance._cleared_pks = related_pks(sender, instance, model)
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if action == "post_clear":
+        pk_set = instance._cleared_pks
+
+    bump_versions(type(instance), [instance.pk])
+    instance.version += 1
+    bump_versions(model, pk_set)
+
+
+for model in apps.get_app_config("app").get_models():
+    if issubclass(model, AbstractType):
+        post_init.connect(remember_icon, sender=model)
+        post_save.connect(swap_icon_reference, sender=model)
+        post_save.connect(enqueue_icon_renditions, sender=model)
+        post_delete.connect(release_deleted_icon, sender=model)
+        post_save.connect(bump_generation, sender=model)
+        post_delete.connect(bump_generation, sender=model)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                bump_related_versions, sender=field.remote_field.through
+            )
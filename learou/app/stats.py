@@ -0,0 +1,149 @@
+"""
+Daily activity rollup.
+
+Counts the diary entries, reviews and created and completed tasks of each
+day into DailyActivity, overall and per related project or technology. Each
+run starts from the watermark left by the previous one, the last day it
+processed, recounts the days since then and moves the watermark to today.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from learou.app.models import (
+    DailyActivity,
+    DiaryEntry,
+    Review,
+    RollupWatermark,
+    Task,
+)
+
+WATERMARK_NAME = "daily_activity"
+
+# kind: (model, date field, {scope: lookup of the scope pk})
+ACTIVITY_SOURCES = {
+    "entry": (DiaryEntry, "created_at", {"project": "project"}),
+    "review": (
+        Review,
+        "created_at",
+        {"project": "project", "technology": "technology"},
+    ),
+    "task_created": (Task, "created_at", {"project": "project"}),
+    "task_completed": (Task, "completed_at", {"project": "project"}),
+}
+
+# Days shown by the heatmap.
+HEATMAP_DAYS = 53 * 7
+
+
+def is_datetime(model, field_name):
+    return isinstance(model._meta.get_field(field_name), models.DateTimeField)
+
+
+def day_expression(model, field_name):
+    if is_datetime(model, field_name):
+        return TruncDate(field_name)
+    return F(field_name)
+
+
+def count_activity(kind, since):
+    """
+    Yields the DailyActivity rows of a kind from the given day on, one
+    aggregate query per scope.
+    """
+    model, field_name, scopes = ACTIVITY_SOURCES[kind]
+    days = model.objects.filter(**{f"{field_name}__isnull": False}).annotate(
+        day=day_expression(model, field_name)
+    )
+    if since > date.min:
+        # Filtering the column rather than its day lets the database use an
+        # index on it.
+        start = since
+        if is_datetime(model, field_name):
+            start = timezone.make_aware(datetime.combine(since, time.min))
+        days = days.filter(**{f"{field_name}__gte": start})
+
+    for row in days.values("day").annotate(count=Count("pk")).order_by():
+        yield DailyActivity(
+            date=row["day"], kind=kind, scope="all", scope_id=0, count=row["count"]
+        )
+
+    for scope, lookup in scopes.items():
+        rows = (
+            days.filter(**{f"{lookup}__isnull": False})
+            .values("day", scope_pk=F(lookup))
+            .annotate(count=Count("pk", distinct=True))
+            .order_by()
+        )
+        for row in rows:
+            yield DailyActivity(
+                date=row["day"],
+                kind=kind,
+                scope=scope,
+                scope_id=row["scope_pk"],
+                count=row["count"],
+            )
+
+
+def rollup_activity(full=False):
+    """
+    Recounts the activity since the watermark, or since the beginning with
+    ``full``, and returns the number of DailyActivity rows written.
+    """
+    today = timezone.localdate()
+    # The first run creates the row, so there is one to lock.
+    RollupWatermark.objects.get_or_create(
+        name=WATERMARK_NAME, defaults={"date": date.min}
+    )
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().get(name=WATERMARK_NAME)
+        # The watermark day itself may have got activity after the last run.
+        since = date.min if full else watermark.date
+
+        rows = [row for kind in ACTIVITY_SOURCES for row in count_activity(kind, since)]
+        DailyActivity.objects.filter(date__gte=since).delete()
+        DailyActivity.objects.bulk_create(rows, batch_size=1000)
+
+        watermark.date = today
+        watermark.save(update_fields=["date"])
+    return len(rows)
+
+
+def heatmap(scope="all", scope_id=0, kinds=None, end=None):
+    """
+    Returns the weeks, Monday first, of the heatmap ending on ``end`` as lists
+    of (day, count, level) tuples, level going from 0 to 4, and the totals
+    per kind. One query.
+    """
+    end = end or timezone.localdate()
+    start = end - timedelta(days=HEATMAP_DAYS - 1)
+    start -= timedelta(days=start.weekday())
+
+    activity = DailyActivity.objects.filter(
+        scope=scope, scope_id=scope_id, date__range=(start, end)
+    )
+    if kinds:
+        activity = activity.filter(kind__in=kinds)
+
+    per_day = {}
+    totals = dict.fromkeys(kinds or ACTIVITY_SOURCES, 0)
+    for day, kind, count in activity.values_list("date", "kind", "count"):
+        per_day[day] = per_day.get(day, 0) + count
+        totals[kind] = totals.get(kind, 0) + count
+
+    busiest = max(per_day.values(), default=0)
+    weeks = []
+    day = start
+    while day <= end:
+        week = []
+        for _ in range(7):
+            count = per_day.get(day, 0) if day <= end else None
+            level = -(-count * 4 // busiest) if count and busiest else 0
+            week.append((day, count, level))
+            day += timedelta(days=1)
+        weeks.append(week)
+    return weeks, totals
@@ -0,0 +1,174 @@
+"""
+Storages of the project.
+
+Content addressed storage for the AbstractType icons.
+
+Every upload is stored under the SHA-256 of its content, so identical icons
+share one file no matter how many rows use them or how often they're uploaded
+again. A StoredBlob row counts the rows referencing each file, the file and its
+renditions are removed when the last one releases it.
+
+As the content of a name never changes, the files can be cached forever, see
+the /media/icons/ location of compose/prod/nginx/default.conf.
+
+Precompressed manifest storage for the static files, nginx serves the .gz
+files next to the hashed assets with gzip_static.
+"""
+
+import gzip
+import hashlib
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, storages
+from django.db import transaction
+from django.db.models import F
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CONTENT_ADDRESSED_PREFIX = "icons"
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".map", ".svg", ".txt", ".json")
+
+
+def icon_storage():
+    return storages["icons"]
+
+
+def content_name(content, name):
+    digest = hashlib.sha256()
+    content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+
+    hexdigest = digest.hexdigest()
+    extension = os.path.splitext(name)[1].lower()
+    return f"{CONTENT_ADDRESSED_PREFIX}/{hexdigest[:2]}/{hexdigest}{extension}"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def __init__(self, **kwargs):
+        # Two uploads of the same content write the same bytes, overwriting
+        # is harmless and avoids renaming the second one.
+        kwargs.setdefault("allow_overwrite", True)
+        super().__init__(**kwargs)
+
+    def is_content_addressed(self, name):
+        return name.startswith(f"{CONTENT_ADDRESSED_PREFIX}/")
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is only known in _save, once the content is hashed.
+        return name
+
+    def _save(self, name, content):
+        from learou.app.models import StoredBlob
+
+        name = content_name(content, name)
+        # The references are taken by the rows using the file, see
+        # learou.app.signals, an upload on its own doesn't count. The lock
+        # waits for a release removing the file, see remove.
+        with transaction.atomic():
+            blob, created = StoredBlob.objects.select_for_update().get_or_create(
+                name=name, defaults={"size": content.size}
+            )
+            if not created and blob.references == 0:
+                # A released file waiting for its removal, a new row tells
+                # remove the file is used again.
+                blob.delete()
+                StoredBlob.objects.create(name=name, size=content.size)
+            if created or not self.exists(name):
+                super()._save(name, content)
+
+        return name
+
+    def acquire(self, name, count=1):
+        """
+        Adds ``count`` references to an already stored file.
+        """
+        from learou.app.models import StoredBlob
+
+        StoredBlob.objects.filter(name=name).update(references=F("references") + count)
+
+    def delete(self, name):
+        """
+        Releases one reference, the file is only removed with the last one.
+        Files stored before this storage was used aren't counted and are kept.
+        """
+        from learou.app.models import StoredBlob
+
+        if not name or not self.is_content_addressed(name):
+            return
+
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return
+
+            if blob.references > 1:
+                StoredBlob.objects.filter(pk=blob.pk).update(
+                    references=F("references") - 1
+                )
+                return
+
+            StoredBlob.objects.filter(pk=blob.pk).update(references=0)
+            transaction.on_commit(lambda: self.remove(name, blob.pk))
+
+    def remove(self, name, pk):
+        """
+        Removes a released file, with its renditions, unless it was stored or
+        acquired again since.
+        """
+        from learou.app.models import IconRendition, StoredBlob
+
+        with transaction.atomic():
+            blob = (
+                StoredBlob.objects.select_for_update()
+                .filter(pk=pk, references=0)
+                .first()
+            )
+            if blob is None:
+                return
+
+            for rendition in IconRendition.objects.filter(source=name):
+                rendition.file.delete(save=False)
+                rendition.delete()
+            blob.delete()
+            super().delete(name)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Writes a gzip, and a brotli one when the module is installed, copy of
+    every hashed text asset during collectstatic.
+    """
+
+    def compressed_variants(self, data):
+        yield ".gz", gzip.compress(data, compresslevel=9, mtime=0)
+        if brotli is not None:
+            yield ".br", brotli.compress(data, quality=11)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            data = original.read()
+
+        for suffix, compressed in self.compressed_variants(data):
+            # Tiny files can grow, serving the original is better then.
+            if len(compressed) >= len(data):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self.compress(hashed_name)
@@ -0,0 +1,134 @@
+import functools
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django_tasks import ResultStatus, task
+from django_tasks.exceptions import ResultDoesNotExist
+
+from learou.app import cascade, linkmeta, renditions, stats
+from learou.app.models import Link
+
+
+def ready_at(enqueued_at, run_after):
+    """
+    Returns when a task could start running, a deferred task waits for its
+    run_after on purpose.
+    """
+    if run_after is None:
+        return enqueued_at
+    return max(enqueued_at, run_after)
+
+
+def retrying(max_attempts=3, backoff=30, retry_on=(Exception,)):
+    """
+    Enqueues a failed task again, up to ``max_attempts`` runs, waiting
+    ``backoff`` seconds before the second one and twice as long before each of
+    the next ones. Goes below @task:
+
+        @task(queue_name="links")
+        @retrying(max_attempts=5, retry_on=(requests.RequestException,))
+        def check_link(pk): ...
+
+    Every failed run stays recorded as failed, the retry is a new result.
+    Backends that can't defer a task don't retry it.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, attempt=1, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except retry_on:
+                if attempt >= max_attempts:
+                    raise
+
+                retry = import_string(f"{func.__module__}.{func.__qualname__}")
+                # A backend that can't defer would retry right away, in the
+                # same process, without any backoff.
+                if not retry.get_backend().supports_defer:
+                    raise
+                delay = timedelta(seconds=backoff * 2 ** (attempt - 1))
+                retry.using(run_after=timezone.now() + delay).enqueue(
+                    *args, attempt=attempt + 1, **kwargs
+                )
+                raise
+
+        return wrapper
+
+    return decorator
+
+
+@task(queue_name="renditions")
+def generate_icon_renditions(source):
+    return renditions.generate_renditions(source)
+
+
+@task(queue_name="links")
+@retrying(max_attempts=3, backoff=60, retry_on=(requests.RequestException,))
+def fetch_link_metadata(link_pk):
+    link = Link.objects.filter(pk=link_pk).first()
+    if link is None:
+        return None
+    return linkmeta.fetch_metadata(link).pk
+
+
+# Id of the periodic rollup_activity waiting to run.
+ROLLUP_PENDING_KEY = "learou:rollup_activity:pending"
+
+
+@task()
+def rollup_activity(full=False, periodic=False):
+    try:
+        return stats.rollup_activity(full=full)
+    finally:
+        # A failed run mustn't stop the next ones.
+        if periodic:
+            schedule_rollup()
+
+
+def schedule_rollup():
+    """
+    Enqueues the next periodic rollup_activity, which enqueues the one after
+    it, unless one is already waiting to run. Started by run_task_workers.
+    Without deferred tasks, run the rollup_activity command instead.
+    """
+    if not rollup_activity.get_backend().supports_defer:
+        return
+
+    pending = cache.get(ROLLUP_PENDING_KEY)
+    if pending is not None:
+        try:
+            if rollup_activity.get_result(pending).status == ResultStatus.NEW:
+                return
+        except ResultDoesNotExist:
+            pass
+
+    interval = timedelta(minutes=settings.ROLLUP_ACTIVITY_INTERVAL_MINUTES)
+    result = rollup_activity.using(run_after=timezone.now() + interval).enqueue(
+        periodic=True
+    )
+    cache.set(ROLLUP_PENDING_KEY, result.id, None)
+
+
+@task()
+def purge_deleted():
+    purged, done = cascade.purge_deleted(max_batches=settings.SOFT_DELETE_PURGE_BATCHES)
+    # Let the other tasks of the queue run between the batches.
+    if not done:
+        purge_deleted.enqueue()
+    return {model._meta.label: rows for model, rows in purged.items()}
+
+
+def schedule_purge():
+    """
+    Enqueues purge_deleted for when the rows deleted now leave the restore
+    window. Without deferred tasks, run the purge_deleted command instead.
+    """
+    if not purge_deleted.get_backend().supports_defer:
+        return
+    delay = timedelta(hours=settings.SOFT_DELETE_RETENTION_HOURS, minutes=1)
+    purge_deleted.using(run_after=timezone.now() + delay).enqueue()
@@ -0,0 +1,23 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag("app/partials/icon_picture.html")
+def icon_picture(obj, rendition_map=None, display_size=64):
+    """
+    Renders the renditions of the icon of ``obj`` as a <picture>, nothing if
+    there are none yet or the template has no rendition map.
+    """
+    renditions = rendition_map.get(obj.icon.name) if rendition_map and obj.icon else []
+    sources = {}
+    for rendition in renditions:
+        sources.setdefault(rendition.format, []).append(rendition)
+
+    fallback = sources.get("webp", [None])[0]
+    return {
+        "sources": sources.items(),
+        "fallback": fallback,
+        "display_size": display_size,
+        "alt": str(obj),
+    }
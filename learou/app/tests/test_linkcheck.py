@@ -0,0 +1,69 @@
+import pytest
+
+from learou.app.linkcheck import LinkChecker
+from learou.app.models import Link
+
+
+@pytest.fixture
+def checker():
+    return LinkChecker(workers=4, per_host_interval=0, timeout=0.5)
+
+
+def test_head_refused_falls_back_to_get(checker, http_server):
+    http_server.routes[("HEAD", "/page")] = (405, {}, b"")
+    http_server.routes["/page"] = (200, {}, b"ok")
+
+    result = checker.check(http_server.url("/page"))
+
+    assert [method for method, _, _ in http_server.requests] == ["HEAD", "GET"]
+    assert result.status_code == 200
+    assert result.final_url == http_server.url("/page")
+    assert result.latency is not None
+    assert result.error == ""
+
+
+def test_redirect_is_followed(checker, http_server):
+    http_server.routes["/old"] = (301, {"Location": http_server.url("/new")}, b"")
+    http_server.routes["/new"] = (200, {}, b"")
+
+    result = checker.check(http_server.url("/old"))
+
+    assert result.status_code == 200
+    assert result.final_url == http_server.url("/new")
+
+
+def test_timeout_is_an_error(checker, http_server):
+    http_server.routes["/slow"] = (200, {"X-Stub-Delay": 2}, b"")
+
+    result = checker.check(http_server.url("/slow"))
+
+    assert result.status_code is None
+    assert result.latency is None
+    assert result.error.startswith("ReadTimeout")
+
+
+def test_check_links_stores_the_results(db, checker, http_server):
+    http_server.routes["/ok"] = (200, {}, b"")
+    ok = Link.objects.create(name="Ok", url=http_server.url("/ok"))
+    missing = Link.objects.create(name="Missing", url=http_server.url("/missing"))
+
+    assert list(checker.check_links(Link.objects.all())) == [2]
+
+    ok.refresh_from_db()
+    missing.refresh_from_db()
+    assert (ok.status_code, ok.final_url, ok.check_error) == (200, ok.url, "")
+    assert missing.status_code == 404
+    assert ok.last_checked_at is not None
+
+    # Same results, same versions.
+    versions = (ok.version, missing.version)
+    list(checker.check_links(Link.objects.all()))
+    ok.refresh_from_db()
+    missing.refresh_from_db()
+    assert (ok.version, missing.version) == versions
+
+    http_server.routes["/missing"] = (200, {}, b"")
+    list(checker.check_links(Link.objects.all()))
+    ok.refresh_from_db()
+    missing.refresh_from_db()
+    assert (ok.version, missing.version) == (versions[0], versions[1] + 1)
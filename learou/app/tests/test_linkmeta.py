@@ -0,0 +1,76 @@
+import pytest
+import requests
+
+from learou.app import linkmeta
+from learou.app.models import Link, LinkMetadata
+
+PAGE = b"""<html><head>
+<title>Learou</title>
+<meta name="description" content="Notes and links">
+<link rel="icon" href="/static/icon.png">
+</head><body></body></html>"""
+
+VALIDATORS = {
+    "Content-Type": "text/html; charset=utf-8",
+    "ETag": '"v1"',
+    "Last-Modified": "Mon, 19 Oct 2026 10:00:00 GMT",
+}
+
+
+def page(handler):
+    if handler.headers.get("If-None-Match") == VALIDATORS["ETag"]:
+        return 304, {}, b""
+    return 200, VALIDATORS, PAGE
+
+
+@pytest.fixture
+def link(db, http_server):
+    http_server.routes["/page"] = page
+    return Link.objects.create(name="Learou", url=http_server.url("/page"))
+
+
+def test_fetch_parses_the_page(link, http_server):
+    metadata = linkmeta.fetch_metadata(link)
+
+    assert metadata.title == "Learou"
+    assert metadata.description == "Notes and links"
+    assert metadata.favicon_url == http_server.url("/static/icon.png")
+    assert (metadata.etag, metadata.last_modified) == (
+        VALIDATORS["ETag"],
+        VALIDATORS["Last-Modified"],
+    )
+
+
+def test_refresh_is_revalidated(link, http_server):
+    first = linkmeta.fetch_metadata(link)
+    LinkMetadata.objects.filter(pk=first.pk).update(title="Kept")
+
+    second = linkmeta.fetch_metadata(link)
+
+    _, _, headers = http_server.requests[-1]
+    assert headers["If-None-Match"] == VALIDATORS["ETag"]
+    assert headers["If-Modified-Since"] == VALIDATORS["Last-Modified"]
+    # Answered with a 304, the page isn't parsed again.
+    assert second.title == "Kept"
+    assert second.fetched_at > first.fetched_at
+
+
+def test_changed_url_is_fetched_again(link, http_server):
+    linkmeta.fetch_metadata(link)
+    http_server.routes["/other"] = page
+    link.url = http_server.url("/other")
+
+    metadata = linkmeta.fetch_metadata(link)
+
+    _, _, headers = http_server.requests[-1]
+    assert "If-None-Match" not in headers
+    assert metadata.url == link.url
+
+
+def test_timeout_is_raised(link, http_server, monkeypatch):
+    monkeypatch.setattr(linkmeta, "FETCH_TIMEOUT", 0.5)
+    http_server.routes["/page"] = (200, {"X-Stub-Delay": 2}, PAGE)
+
+    with pytest.raises(requests.Timeout):
+        linkmeta.fetch_metadata(link)
+    assert not LinkMetadata.objects.exists()
@@ -0,0 +1,47 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.urls import reverse
+from PIL import Image
+
+from learou.app.models import IconRendition, TaskStatus
+from learou.app.renditions import generate_renditions
+
+
+def png(color="red"):
+    buffer = BytesIO()
+    Image.new("RGB", (256, 256), color).save(buffer, format="PNG")
+    return SimpleUploadedFile("icon.png", buffer.getvalue(), content_type="image/png")
+
+
+@pytest.fixture
+def status_with_icon(db):
+    return TaskStatus.objects.create(name="Open", icon=png())
+
+
+def render_picture(obj, template):
+    return Template("{% load renditions %}" + template).render(Context({"obj": obj}))
+
+
+def test_icon_picture_without_rendition_map(status_with_icon):
+    assert render_picture(status_with_icon, "{% icon_picture obj %}").strip() == ""
+    assert (
+        render_picture(status_with_icon, "{% icon_picture obj missing %}").strip() == ""
+    )
+
+
+def test_list_revalidated_once_the_renditions_exist(
+    client, shared_cache, status_with_icon
+):
+    url = reverse("task_status_list")
+    response = client.get(url)
+    assert b"<picture" not in response.content
+
+    generate_renditions(status_with_icon.icon.name)
+    assert IconRendition.objects.count() == 4
+
+    response = client.get(url, headers={"if-none-match": response.headers["ETag"]})
+    assert response.status_code == 200
+    assert b"<picture" in response.content
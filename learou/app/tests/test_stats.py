@@ -0,0 +1,59 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from learou.app.models import (
+    DailyActivity,
+    RollupWatermark,
+    Task,
+    TaskStatus,
+    TaskType,
+)
+from learou.app.stats import WATERMARK_NAME, rollup_activity
+
+
+@pytest.fixture
+def tasks(db):
+    task_type = TaskType.objects.create(name="Feature")
+    return [
+        Task.objects.create(
+            name="Open task",
+            status=TaskStatus.objects.create(name="Open"),
+            task_type=task_type,
+        ),
+        Task.objects.create(
+            name="Done task",
+            status=TaskStatus.objects.create(name="Done", is_done=True),
+            task_type=task_type,
+        ),
+    ]
+
+
+def daily_counts():
+    return dict(DailyActivity.objects.filter(scope="all").values_list("kind", "count"))
+
+
+def test_first_rollup_skips_tasks_never_completed(tasks):
+    call_command("rollup_activity", stdout=StringIO())
+
+    assert daily_counts() == {"task_created": 2, "task_completed": 1}
+    watermark = RollupWatermark.objects.get(name=WATERMARK_NAME)
+    assert watermark.date == timezone.localdate()
+
+
+def test_full_rollup_skips_tasks_never_completed(tasks):
+    rollup_activity()
+    rollup_activity(full=True)
+
+    assert daily_counts() == {"task_created": 2, "task_completed": 1}
+    assert RollupWatermark.objects.count() == 1
+
+
+def test_rollup_skips_tasks_created_before_the_date_was_recorded(tasks):
+    Task.objects.filter(pk=tasks[0].pk).update(created_at=None)
+
+    rollup_activity()
+
+    assert daily_counts() == {"task_created": 1, "task_completed": 1}
@@ -0,0 +1,47 @@
+import pytest
+from django.core.files.storage import default_storage
+
+from learou.app.models import IconRendition, StoredBlob
+from learou.app.renditions import generate_renditions
+from learou.app.storage import icon_storage
+from learou.app.tests.test_renditions import png
+
+
+@pytest.fixture
+def stored_icon(db):
+    storage = icon_storage()
+    name = storage.save("icon.png", png())
+    storage.acquire(name)
+    return name
+
+
+def test_last_release_removes_the_file_and_its_renditions(
+    stored_icon, django_capture_on_commit_callbacks
+):
+    generate_renditions(stored_icon)
+    renditions = [rendition.file.name for rendition in IconRendition.objects.all()]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        icon_storage().delete(stored_icon)
+
+    assert not icon_storage().exists(stored_icon)
+    assert not StoredBlob.objects.exists()
+    assert not IconRendition.objects.exists()
+    assert not any(default_storage.exists(name) for name in renditions)
+
+
+def test_file_stored_again_before_its_removal_is_kept(
+    stored_icon, django_capture_on_commit_callbacks
+):
+    storage = icon_storage()
+    with django_capture_on_commit_callbacks() as callbacks:
+        storage.delete(stored_icon)
+
+    # The row saving it takes its reference after the removal ran.
+    assert storage.save("again.png", png()) == stored_icon
+    for callback in callbacks:
+        callback()
+    storage.acquire(stored_icon)
+
+    assert storage.exists(stored_icon)
+    assert StoredBlob.objects.get(name=stored_icon).references == 1
@@ -0,0 +1,118 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from django_tasks import ResultStatus
+from django_tasks.backends.database.models import DBTaskResult
+
+from learou.app import stats, tasks
+
+
+@pytest.fixture
+def database_backend(settings, db):
+    settings.TASKS = {
+        "default": {
+            **settings.TASKS["default"],
+            "BACKEND": "django_tasks.backends.database.DatabaseBackend",
+            # The test transaction is never committed.
+            "ENQUEUE_ON_COMMIT": False,
+        }
+    }
+    cache.delete(tasks.ROLLUP_PENDING_KEY)
+
+
+def pending_rollups():
+    return DBTaskResult.objects.filter(
+        task_path="learou.app.tasks.rollup_activity", status=ResultStatus.NEW
+    )
+
+
+def test_schedule_rollup_once(database_backend):
+    tasks.schedule_rollup()
+    tasks.schedule_rollup()
+
+    assert pending_rollups().count() == 1
+
+
+def test_schedule_rollup_after_the_pending_one_started(database_backend):
+    tasks.schedule_rollup()
+    pending_rollups().update(status=ResultStatus.RUNNING)
+
+    tasks.schedule_rollup()
+
+    assert pending_rollups().count() == 1
+
+
+def test_failed_rollup_schedules_the_next_one(database_backend, monkeypatch):
+    tasks.schedule_rollup()
+    pending_rollups().update(status=ResultStatus.RUNNING)
+
+    def fail(full=False):
+        raise RuntimeError
+
+    monkeypatch.setattr(stats, "rollup_activity", fail)
+    with pytest.raises(RuntimeError):
+        tasks.rollup_activity.call(periodic=True)
+
+    assert pending_rollups().count() == 1
+
+
+def test_schedule_rollup_without_defer(db):
+    tasks.schedule_rollup()
+
+    assert not DBTaskResult.objects.exists()
+
+
+def task_result(status, enqueued_at, run_after=None, started_at=None):
+    result = DBTaskResult.objects.create(
+        task_path="learou.app.tasks.purge_deleted",
+        args_kwargs={"args": [], "kwargs": {}},
+        backend_name="default",
+        status=status,
+        run_after=run_after,
+        started_at=started_at,
+        finished_at=started_at and started_at + timedelta(seconds=1),
+    )
+    DBTaskResult.objects.filter(pk=result.pk).update(enqueued_at=enqueued_at)
+
+
+def test_ready_at():
+    now = timezone.now()
+    assert tasks.ready_at(now, None) == now
+    assert tasks.ready_at(now, now + timedelta(hours=1)) == now + timedelta(hours=1)
+    assert tasks.ready_at(now, now - timedelta(hours=1)) == now
+
+
+def test_task_stats_leaves_the_deferred_wait_out(database_backend):
+    now = timezone.now()
+    # Ran 2s after its run_after, three days after it was enqueued.
+    run_after = now - timedelta(minutes=5)
+    task_result(
+        ResultStatus.SUCCEEDED,
+        enqueued_at=run_after - timedelta(days=3),
+        run_after=run_after,
+        started_at=run_after + timedelta(seconds=2),
+    )
+    # Waiting for its run_after, not ready yet.
+    task_result(
+        ResultStatus.NEW,
+        enqueued_at=now - timedelta(days=1),
+        run_after=now + timedelta(days=2),
+    )
+    task_result(ResultStatus.NEW, enqueued_at=now - timedelta(seconds=30))
+
+    out = StringIO()
+    call_command("task_stats", stdout=out)
+
+    queue = next(
+        line.split()
+        for line in out.getvalue().splitlines()
+        if line.startswith("default")
+    )
+    ready, oldest, wait = queue[1], queue[2], queue[5]
+    assert ready == "1"
+    assert 29 <= int(oldest.rstrip("s")) <= 40
+    assert wait == "2.0s"
@@ -0,0 +1,44 @@
+import pytest
+from django.urls import reverse
+
+from learou.app.models import Task, TaskStatus, TaskType
+
+
+@pytest.fixture
+def statuses(db):
+    return [TaskStatus.objects.create(name=name) for name in ("Open", "Done")]
+
+
+def revalidate(client, url, django_assert_num_queries, queries):
+    etag = client.get(url).headers["ETag"]
+    with django_assert_num_queries(queries):
+        response = client.get(url, headers={"if-none-match": etag})
+    assert response.status_code == 304
+
+
+def test_validated_list_costs_no_query(
+    client, shared_cache, statuses, django_assert_num_queries
+):
+    revalidate(client, reverse("task_status_list"), django_assert_num_queries, 0)
+
+
+def test_validated_list_without_generation_costs_one_query(
+    client, statuses, django_assert_num_queries
+):
+    revalidate(client, reverse("task_status_list"), django_assert_num_queries, 1)
+
+
+def test_detail_revalidated_when_a_related_object_changes(client, statuses):
+    task = Task.objects.create(
+        name="Task", status=statuses[0], task_type=TaskType.objects.create(name="Bug")
+    )
+    url = reverse("task_detail", args=[task.pk])
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"if-none-match": etag}).status_code == 304
+
+    statuses[0].name = "Reopened"
+    statuses[0].save()
+
+    response = client.get(url, headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert b"Reopened" in response.content
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 
 from learou.app import views
@@ -31,6 +32,9 @@ list_views = [
     views.MilestoneListView,
 ]
 
+if settings.ASYNC_VIEWS:
+    list_views = [views.as_async_view(view) for view in list_views]
+
 list_urls = [make_view_url(view=view, view_type="list") for view in list_views]
 
 detail_views = [
@@ -53,6 +57,9 @@ detail_views = [
     views.MilestoneDetailView,
 ]
 
+if settings.ASYNC_VIEWS:
+    detail_views = [views.as_async_view(view) for view in detail_views]
+
 detail_urls = [
     make_view_url(view=view, view_type="detail", extra_url="<int:pk>/")
     for view in detail_views
@@ -83,6 +90,33 @@ update_urls = [
     for view in update_views
 ]
 
+field_update_views = [
+    views.TaskTypeFieldUpdateView,
+    views.TaskStatusFieldUpdateView,
+    views.TaskFieldUpdateView,
+    views.LinkTypeFieldUpdateView,
+    views.LinkFieldUpdateView,
+    views.ReviewFieldUpdateView,
+    views.AuthorFieldUpdateView,
+    views.BibliographyTypeFieldUpdateView,
+    views.BibliographyFieldUpdateView,
+    views.CheatSheetFieldUpdateView,
+    views.TechnologyFieldUpdateView,
+    views.ProjectTypeFieldUpdateView,
+    views.ProjectStatusFieldUpdateView,
+    views.ProjectFieldUpdateView,
+    views.DiaryFieldUpdateView,
+    views.DiaryEntryFieldUpdateView,
+    views.MilestoneFieldUpdateView,
+]
+
+field_update_urls = [
+    make_view_url(
+        view=view, view_type="field_update", extra_url="<int:pk>/edit/<str:field>/"
+    )
+    for view in field_update_views
+]
+
 create_views = [
     views.TaskTypeCreateView,
     views.TaskStatusCreateView,
@@ -132,4 +166,40 @@ delete_urls = [
     make_view_url(view=view, view_type="delete", extra_url="<int:pk>/delete/")
     for view in delete_views
 ]
-urlpatterns = list_urls + update_urls + detail_urls + create_urls + delete_urls
+
+timeline_urls = [
+    make_view_url(
+        view=views.DiaryTimelineView,
+        view_type="timeline",
+        extra_url="<int:pk>/timeline/",
+    ),
+]
+
+board_urls = [
+    make_view_url(
+        view=views.ProjectBoardView,
+        view_type="board",
+        extra_url="<int:pk>/board/",
+    ),
+    make_view_url(
+        view=views.ProjectBoardMoveView,
+        view_type="board_move",
+        extra_url="<int:pk>/board/move/",
+    ),
+]
+
+stats_urls = [
+    path("activity/", views.ActivityView.as_view(), name="activity"),
+]
+
+urlpatterns = (
+    list_urls
+    + update_urls
+    + field_update_urls
+    + detail_urls
+    + create_urls
+    + delete_urls
+    + timeline_urls
+    + board_urls
+    + stats_urls
+)
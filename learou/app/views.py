@@ -1,21 +1,71 @@
+import hashlib
+from contextlib import nullcontext
+from datetime import date, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
-from django.http import HttpResponse, HttpResponseForbidden
+from django.core.exceptions import BadRequest, FieldDoesNotExist
+from django.db.models import Count, F, Max, Q, QuerySet, Sum, Window
+from django.db.models.functions import RowNumber, TruncDay, TruncMonth, TruncWeek
+from django.forms import modelform_factory
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    HttpResponseRedirect,
+)
 from django.shortcuts import render
 from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
+from django.views import View
+from django.views.generic.detail import SingleObjectMixin
 from django.views.generic import (
     CreateView,
     DeleteView,
     ListView,
     DetailView,
+    TemplateView,
     UpdateView,
 )
 
-from learou.app import models, forms
+from learou.app import cascade, models, forms, stats, tasks
+from learou.app.renditions import RenditionMap
+from learou.routers import (
+    is_pinned_to_primary,
+    pin_to_primary,
+    read_from_replica,
+    reading_from_replica,
+)
 
 # Base and generic classes
 
 
-class GenericListView(ListView):
+class ReadReplicaMixin:
+    """
+    Serves GET requests from the read replica, unless the session has just
+    written something and must keep reading from the primary.
+    """
+
+    def get_read_context(self, request):
+        if request.method not in ("GET", "HEAD") or is_pinned_to_primary(request):
+            return nullcontext()
+        return read_from_replica()
+
+    def dispatch(self, request, *args, **kwargs):
+        with self.get_read_context(request):
+            response = super().dispatch(request, *args, **kwargs)
+            # Template responses query lazily, render them while the replica
+            # is still selected.
+            if hasattr(response, "render"):
+                response.render()
+            return response
+
+
+class GenericListView(ReadReplicaMixin, ListView):
     model = None
     model_name = None
     template_name = "app/base_list.html"
@@ -32,9 +82,87 @@ class GenericListView(ListView):
             raise Exception("No model name provided")
         context = super().get_context_data(object_list=object_list, **kwargs)
         context["model_name"] = self.model_name
+        context["icon_renditions"] = RenditionMap(context["object_list"])
         return context
 
 
+class GenericDetailView(ReadReplicaMixin, DetailView):
+    def get_queryset(self):
+        # The page and its ETag read every foreign key, fetch them in the same
+        # query.
+        related_fields = [
+            field.name for field in self.model._meta.fields if field.many_to_one
+        ]
+        return super().get_queryset().select_related(*related_fields)
+
+
+class AsyncViewMixin:
+    """
+    Serves a GET-only view from an async handler, so under ASGI a slow client
+    waits on the event loop instead of holding a worker thread.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        return self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        # The lazy request.user does a sync query, which isn't allowed on the
+        # event loop. Resolving it here also loads the session.
+        request.user = await request.auser()
+
+        with self.get_read_context(request):
+            response = super().dispatch(request, *args, **kwargs)
+            if not isinstance(response, HttpResponse):
+                response = await response
+            if hasattr(response, "render"):
+                await sync_to_async(response.render)()
+            return response
+
+
+class AsyncGenericListMixin(AsyncViewMixin):
+    async def get(self, request, *args, **kwargs):
+        self.object_list = [obj async for obj in self.get_queryset()]
+        context = self.get_context_data()
+        return self.render_to_response(context)
+
+
+class AsyncGenericDetailMixin(AsyncViewMixin):
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+
+        # get_all_fields reads every foreign key, fetch them in the same query.
+        related_fields = [
+            field.name for field in self.model._meta.fields if field.many_to_one
+        ]
+        try:
+            return await queryset.select_related(*related_fields).aget(
+                pk=self.kwargs.get(self.pk_url_kwarg)
+            )
+        except queryset.model.DoesNotExist:
+            raise Http404(f"No {self.model_name} found matching the query")
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+
+def as_async_view(view):
+    """
+    Returns a subclass of the given list or detail view served by an async
+    handler.
+    """
+    if issubclass(view, GenericListView):
+        mixin = AsyncGenericListMixin
+    elif issubclass(view, GenericDetailView):
+        mixin = AsyncGenericDetailMixin
+    else:
+        raise ValueError(f"{view.__name__} has no async version")
+
+    return type(f"Async{view.__name__}", (mixin, view), {})
+
+
 class PermissionsMixin:
     def dispatch(self, request, *args, **kwargs):
         if not self.request.user.is_authenticated:
@@ -59,7 +187,8 @@ class BaseViewMixin:
     success_url = detail_url
     model_name = ""
 
-    EXCLUDED_FIELDS = ["id", "name", "description"]
+    EXCLUDED_FIELDS = ["id", "name", "description", "version", "deleted_at"]
+    INLINE_EXCLUDED_FIELDS = ["id", "name", "version", "deleted_at"]
 
     def get_all_fields(self):
         if not getattr(self, "object", None):
@@ -79,6 +208,187 @@ class BaseViewMixin:
 
         return model_fields
 
+    def get_inline_fields(self):
+        """
+        Returns the (name, label, value, editable) of the fields, the editable
+        ones can be edited one at a time. Many to many values are left out,
+        reading them would cost a query per relation; the inline form loads
+        them.
+        """
+        if not getattr(self, "object", None):
+            return
+
+        inline_fields = []
+        for field in [*self.model._meta.fields, *self.model._meta.many_to_many]:
+            if field.name in self.INLINE_EXCLUDED_FIELDS:
+                continue
+
+            if field.many_to_many:
+                value = None
+            elif field.many_to_one or field.one_to_one:
+                value = display_value(getattr(self.object, field.name, None))
+            else:
+                value = display_value(field.value_from_object(self.object))
+            inline_fields.append(
+                (field.name, field.verbose_name, value, field.editable)
+            )
+
+        return inline_fields
+
+    def has_updated_at(self):
+        # Only a few models keep track of their modification time.
+        try:
+            self.model._meta.get_field("updated_at")
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def get_list_generation(self):
+        if not hasattr(self, "_list_generation"):
+            # The generation follows the primary, a lagging replica would send
+            # an older list under it. The aggregates are read with the list.
+            self._list_generation = (
+                None if reading_from_replica() else models.model_generation(self.model)
+            )
+        return self._list_generation
+
+    def get_list_aggregates(self):
+        """
+        Returns the version sum, count, highest pk and, when the model has
+        it, latest modification time of the list, in one query.
+        """
+        if hasattr(self, "_list_aggregates"):
+            return self._list_aggregates
+
+        # The async views have already fetched the list, the sync ones still
+        # have a queryset.
+        if isinstance(self.object_list, list):
+            objects = self.object_list
+            aggregates = {
+                "version_sum": sum(obj.version for obj in objects),
+                "count": len(objects),
+                "max_pk": max((obj.pk for obj in objects), default=None),
+            }
+            if self.has_updated_at():
+                aggregates["updated_at"] = max(
+                    (obj.updated_at for obj in objects), default=None
+                )
+        else:
+            expressions = {
+                "version_sum": Sum("version"),
+                "count": Count("pk"),
+                "max_pk": Max("pk"),
+            }
+            if self.has_updated_at():
+                expressions["updated_at"] = Max("updated_at")
+            aggregates = self.object_list.aggregate(**expressions)
+
+        self._list_aggregates = aggregates
+        return aggregates
+
+    def get_related_objects(self):
+        """
+        Returns the objects the foreign keys of a detail page point to, the
+        page shows them too.
+        """
+        related_objects = []
+        for field in self.model._meta.fields:
+            if field.many_to_one or field.one_to_one:
+                related_object = getattr(self.object, field.name, None)
+                if related_object is not None:
+                    related_objects.append(related_object)
+        return related_objects
+
+    def get_last_modified(self):
+        if not self.has_updated_at():
+            return None
+
+        if isinstance(self, DetailView):
+            objects = [self.object, *self.get_related_objects()]
+            if not all(hasattr(obj, "updated_at") for obj in objects):
+                return None
+            return max(obj.updated_at for obj in objects)
+
+        # The generation already validates the list without a query.
+        if self.get_list_generation() is not None:
+            return None
+        return self.get_list_aggregates()["updated_at"]
+
+    def get_version(self):
+        """
+        Returns what changes with the objects of a list or detail page, or None
+        when it isn't one.
+        """
+        if isinstance(self, DetailView):
+            # Renaming the status of a task changes the task page too.
+            related_objects = self.get_related_objects()
+            if not all(hasattr(obj, "version") for obj in related_objects):
+                return None
+            return self.object.version, *(
+                (obj._meta.label, obj.pk, obj.version) for obj in related_objects
+            )
+
+        if not isinstance(self, ListView):
+            return None
+
+        generation = self.get_list_generation()
+        if generation is not None:
+            return generation
+
+        # Without a shared cache: saves raise the versions, deletes lower the
+        # count and creations raise the highest pk.
+        aggregates = self.get_list_aggregates()
+        return aggregates["version_sum"], aggregates["count"], aggregates["max_pk"]
+
+    def get_validators(self):
+        """
+        Returns the ETag and Last-Modified of the page, or None when it can't
+        be validated. The ETag covers what the page shows besides the objects:
+        the user and whether it's the full page or the HTMX partial.
+        """
+        if self.request.method not in ("GET", "HEAD"):
+            return None
+
+        # Pending messages are rendered once, the page must be sent again.
+        if len(messages.get_messages(self.request)):
+            return None
+
+        version = self.get_version()
+        if version is None:
+            return None
+
+        key = ":".join(
+            str(part)
+            for part in (
+                self.model._meta.label,
+                self.request.get_full_path(),
+                version,
+                self.request.user.pk,
+                bool(self.request.htmx),
+            )
+        )
+        etag = quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+        last_modified = self.get_last_modified()
+        return etag, last_modified and int(last_modified.timestamp())
+
+    def render_to_response(self, context, **response_kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().render_to_response(context, **response_kwargs)
+
+        etag, last_modified = validators
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().render_to_response(context, **response_kwargs)
+
+        response.headers["ETag"] = etag
+        if last_modified:
+            response.headers["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ["Cookie", "HX-Request"])
+        return response
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["list_url"] = f"{self.base_url}_list"
@@ -90,9 +400,44 @@ class BaseViewMixin:
         model_fields = self.get_all_fields()
         if model_fields:
             context["model_fields"] = model_fields
+        if self.request.user.is_authenticated and isinstance(self, DetailView):
+            context["field_update_url"] = f"{self.base_url}_field_update"
+            context["inline_fields"] = self.get_inline_fields()
         return context
 
 
+def display_value(value):
+    if hasattr(value, "all"):
+        value = value.all()
+    if isinstance(value, (list, tuple, QuerySet)):
+        return ", ".join(str(item) for item in value) or "-"
+    if value in (None, ""):
+        return "-"
+    return str(value)
+
+
+def deleted_response(request, base_url):
+    messages.warning(request, "This item was deleted in the meantime")
+    htmx_response = HttpResponse()
+    htmx_response["HX-Redirect"] = reverse(f"{base_url}_list")
+    return htmx_response
+
+
+def set_form_data(data, name, value):
+    """
+    Puts a prepared form value back into submitted data.
+    """
+    if isinstance(value, (list, tuple)):
+        data.setlist(name, [str(item) for item in value])
+    elif value is None:
+        data[name] = ""
+    elif value is False:
+        # An unchecked checkbox isn't submitted.
+        data.pop(name, None)
+    else:
+        data[name] = str(value)
+
+
 class HTMXTemplateMixin:
     htmx_template_name = None
     template_name = "app/base_detail.html"
@@ -108,6 +453,7 @@ class HTMXTemplateMixin:
         try:
             is_create = not bool(getattr(self, "object", None) and self.object.pk)
             response = super().form_valid(form)
+            pin_to_primary(self.request)
 
             if not self.request.htmx:
                 return response
@@ -116,6 +462,8 @@ class HTMXTemplateMixin:
                 return self.create_response()
 
             return self.update_response()
+        except models.VersionConflict:
+            return self.conflict_response(form)
         except Exception as request_error:
             messages.warning(self.request, f"An error occurred: {request_error}")
             messages.info(
@@ -152,6 +500,53 @@ class HTMXTemplateMixin:
         messages.success(self.request, "Your item was successfully updated!")
         return render(self.request, self.template_name, context)
 
+    def conflict_response(self, form):
+        """
+        Compares the values the form was loaded with, the submitted ones and
+        the current ones. The fields only somebody else changed keep their
+        value and the rest is saved on top of them. The fields both sides
+        changed differently are shown side by side, with the form ready to
+        overwrite them.
+        """
+        current = type(self.object).objects.filter(pk=self.object.pk).first()
+        if current is None:
+            return deleted_response(self.request, self.base_url)
+
+        current_values = form.__class__(instance=current)
+        theirs = current_values.initial_snapshot()
+        mine = form.cleaned_snapshot()
+        loaded = form.loaded_snapshot()
+
+        data = self.request.POST.copy()
+        conflicts = []
+        for name in form.snapshot_fields():
+            if mine[name] == theirs[name]:
+                continue
+            # Without the loaded values every difference is a conflict.
+            if loaded is not None and theirs[name] == loaded.get(name):
+                continue
+            if loaded is not None and mine[name] == loaded.get(name):
+                set_form_data(data, name, current_values[name].value())
+                continue
+
+            conflicts.append(
+                (
+                    form.fields[name].label or name,
+                    display_value(form.cleaned_data.get(name)),
+                    display_value(getattr(current, name)),
+                )
+            )
+
+        data["version"] = current.version
+        data["loaded"] = current_values["loaded"].initial
+        self.object = current
+        current_form = form.__class__(data, self.request.FILES, instance=current)
+        if not conflicts and current_form.is_valid():
+            return self.form_valid(current_form)
+
+        context = self.get_context_data(form=current_form, conflicts=conflicts)
+        return render(self.request, self.htmx_template_name, context)
+
 
 class DeleteViewMixin(PermissionsMixin, HTMXTemplateMixin, DeleteView):
     template_name = "app/base_detail.html"
@@ -160,12 +555,38 @@ class DeleteViewMixin(PermissionsMixin, HTMXTemplateMixin, DeleteView):
     def get_success_url(self):
         return reverse(self.base_url + "_list")
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        cascade_counts = []
+        for model, count in cascade.cascade_counts(self.object):
+            name = (
+                model._meta.verbose_name
+                if count == 1
+                else model._meta.verbose_name_plural
+            )
+            # Rows of the same model hang below it, such as subprojects.
+            if model is type(self.object):
+                name = f"sub{name}"
+            cascade_counts.append((count, name))
+        context["cascade_counts"] = cascade_counts
+        return context
+
+    def delete_object(self):
+        if not settings.SOFT_DELETE:
+            self.object.delete()
+            return
+
+        # Hidden right away, the rows are removed later by purge_deleted.
+        cascade.soft_delete(self.object)
+        tasks.schedule_purge()
+
     def form_valid(self, form):
         try:
+            pin_to_primary(self.request)
+            self.delete_object()
             if not self.request.htmx:
-                return super().form_valid(form)
+                return HttpResponseRedirect(self.get_success_url())
 
-            self.delete(self.request)
             messages.success(self.request, "The deletion was succesful")
             return HttpResponse(headers={"HX-Redirect": self.get_success_url()})
 
@@ -300,7 +721,11 @@ class TaskListView(BaseTaskViewMixin, GenericListView): ...
 class LinkTypeListView(BaseLinkTypeViewMixin, GenericListView): ...
 
 
-class LinkListView(BaseLinkViewMixin, GenericListView): ...
+class LinkListView(BaseLinkViewMixin, GenericListView):
+    template_name = "app/link_list.html"
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("metadata")
 
 
 class ReviewListView(BaseReviewViewMixin, GenericListView): ...
@@ -390,7 +815,7 @@ class ReviewUpdateView(
 ):
     form_class = forms.ReviewForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class AuthorUpdateView(
@@ -398,7 +823,7 @@ class AuthorUpdateView(
 ):
     form_class = forms.AuthorForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class BibliographyTypeUpdateView(
@@ -409,7 +834,7 @@ class BibliographyTypeUpdateView(
 ):
     form_class = forms.BibliographyForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class BibliographyUpdateView(
@@ -420,7 +845,7 @@ class BibliographyUpdateView(
 ):
     form_class = forms.BibliographyForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class CheatSheetUpdateView(
@@ -431,7 +856,7 @@ class CheatSheetUpdateView(
 ):
     form_class = forms.CheatSheetForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class TechnologyUpdateView(
@@ -442,7 +867,7 @@ class TechnologyUpdateView(
 ):
     form_class = forms.TechnologyForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class ProjectStatusUpdateView(
@@ -453,7 +878,7 @@ class ProjectStatusUpdateView(
 ):
     form_class = forms.ProjectStatusForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class ProjectUpdateView(
@@ -461,7 +886,7 @@ class ProjectUpdateView(
 ):
     form_class = forms.ProjectForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class DiaryUpdateView(
@@ -469,7 +894,7 @@ class DiaryUpdateView(
 ):
     form_class = forms.DiaryForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class DiaryEntryUpdateView(
@@ -480,7 +905,7 @@ class DiaryEntryUpdateView(
 ):
     form_class = forms.DiaryEntryForm
     template_name = "app/partials/base_fields.html"
-    htmx_template_name = "app/partials/base_form."
+    htmx_template_name = "app/partials/base_form.html"
 
 
 class TaskTypeUpdateView(
@@ -513,30 +938,30 @@ class MilestoneUpdateView(
 
 
 class ProjectTypeDetailView(
-    BaseProjectTypeViewMixin, HTMXTemplateMixin, DetailView
+    BaseProjectTypeViewMixin, HTMXTemplateMixin, GenericDetailView
 ): ...
 
 
-class TaskDetailView(BaseTaskViewMixin, HTMXTemplateMixin, DetailView): ...
+class TaskDetailView(BaseTaskViewMixin, HTMXTemplateMixin, GenericDetailView): ...
 
 
 class LinkTypeDetailView(
-    BaseLinkTypeViewMixin, HTMXTemplateMixin, PermissionsMixin, DetailView
+    BaseLinkTypeViewMixin, HTMXTemplateMixin, PermissionsMixin, GenericDetailView
 ): ...
 
 
 class LinkDetailView(
-    BaseLinkViewMixin, HTMXTemplateMixin, PermissionsMixin, DetailView
+    BaseLinkViewMixin, HTMXTemplateMixin, PermissionsMixin, GenericDetailView
 ): ...
 
 
 class ReviewDetailView(
-    BaseReviewViewMixin, HTMXTemplateMixin, PermissionsMixin, DetailView
+    BaseReviewViewMixin, HTMXTemplateMixin, PermissionsMixin, GenericDetailView
 ): ...
 
 
 class AuthorDetailView(
-    BaseAuthorViewMixin, HTMXTemplateMixin, PermissionsMixin, DetailView
+    BaseAuthorViewMixin, HTMXTemplateMixin, PermissionsMixin, GenericDetailView
 ): ...
 
 
@@ -544,7 +969,7 @@ class BibliographyTypeDetailView(
     BaseBibliographyTypeViewMixin,
     HTMXTemplateMixin,
     PermissionsMixin,
-    DetailView,
+    GenericDetailView,
 ): ...
 
 
@@ -552,7 +977,7 @@ class BibliographyDetailView(
     BaseBibliographyViewMixin,
     HTMXTemplateMixin,
     PermissionsMixin,
-    DetailView,
+    GenericDetailView,
 ): ...
 
 
@@ -560,7 +985,7 @@ class CheatSheetDetailView(
     BaseCheatSheetViewMixin,
     HTMXTemplateMixin,
     PermissionsMixin,
-    DetailView,
+    GenericDetailView,
 ): ...
 
 
@@ -568,7 +993,7 @@ class TechnologyDetailView(
     BaseTechnologyViewMixin,
     HTMXTemplateMixin,
     PermissionsMixin,
-    DetailView,
+    GenericDetailView,
 ): ...
 
 
@@ -576,35 +1001,49 @@ class ProjectStatusDetailView(
     BaseProjectStatusViewMixin,
     HTMXTemplateMixin,
     PermissionsMixin,
-    DetailView,
+    GenericDetailView,
 ): ...
 
 
 class ProjectDetailView(
-    BaseProjectViewMixin, HTMXTemplateMixin, PermissionsMixin, DetailView
-): ...
+    BaseProjectViewMixin, HTMXTemplateMixin, PermissionsMixin, GenericDetailView
+):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["board_url"] = f"{self.base_url}_board"
+        return context
 
 
 class DiaryDetailView(
-    BaseDiaryViewMixin, HTMXTemplateMixin, PermissionsMixin, DetailView
-): ...
+    BaseDiaryViewMixin, HTMXTemplateMixin, PermissionsMixin, GenericDetailView
+):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["timeline_url"] = f"{self.base_url}_timeline"
+        return context
 
 
 class DiaryEntryDetailView(
     BaseDiaryEntryViewMixin,
     HTMXTemplateMixin,
     PermissionsMixin,
-    DetailView,
+    GenericDetailView,
 ): ...
 
 
-class TaskTypeDetailView(BaseTaskTypeViewMixin, HTMXTemplateMixin, DetailView): ...
+class TaskTypeDetailView(
+    BaseTaskTypeViewMixin, HTMXTemplateMixin, GenericDetailView
+): ...
 
 
-class TaskStatusDetailView(BaseTaskStatusViewMixin, HTMXTemplateMixin, DetailView): ...
+class TaskStatusDetailView(
+    BaseTaskStatusViewMixin, HTMXTemplateMixin, GenericDetailView
+): ...
 
 
-class MilestoneDetailView(BaseMilestoneViewMixin, HTMXTemplateMixin, DetailView): ...
+class MilestoneDetailView(
+    BaseMilestoneViewMixin, HTMXTemplateMixin, GenericDetailView
+): ...
 
 
 # ------------------
@@ -802,3 +1241,432 @@ class DiaryEntryDeleteView(BaseDiaryEntryViewMixin, DeleteViewMixin): ...
 
 
 class MilestoneDeleteView(BaseMilestoneViewMixin, DeleteViewMixin): ...
+
+
+# ------------------
+# TIMELINE VIEWS
+# ------------------
+
+
+class DiaryTimelineView(BaseDiaryViewMixin, PermissionsMixin, GenericDetailView):
+    """
+    Entries of a diary over a period: their number per day, week or month,
+    counted in one aggregate query, and the entries themselves, newest first
+    and keyset paginated so any page costs the same.
+    """
+
+    template_name = "app/diary_timeline.html"
+    htmx_template_name = "app/partials/timeline_entries.html"
+    paginate_by = 20
+    default_period = timedelta(days=365)
+    TRUNCATE = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+
+    def get_template_names(self):
+        # The "more" button only asks for the next entries.
+        if self.request.htmx:
+            return [self.htmx_template_name]
+        return [self.template_name]
+
+    def get_version(self):
+        # The page shows the entries, not the diary, its version doesn't cover it.
+        return None
+
+    def get_timeline_filters(self):
+        form = forms.DiaryTimelineForm(self.request.GET)
+        if not form.is_valid():
+            raise BadRequest(form.errors.as_text())
+
+        end = form.cleaned_data["end"] or date.today()
+        start = form.cleaned_data["start"] or end - self.default_period
+        return {
+            "start": start,
+            "end": end,
+            "bucket": form.cleaned_data["bucket"] or "month",
+            "before": form.cleaned_data["before"],
+            "before_pk": form.cleaned_data["before_pk"],
+        }
+
+    def get_entries(self, filters):
+        return models.DiaryEntry.objects.filter(
+            diary=self.object, created_at__range=(filters["start"], filters["end"])
+        )
+
+    def get_buckets(self, entries, bucket):
+        buckets = list(
+            entries.annotate(period=self.TRUNCATE[bucket]("created_at"))
+            .values("period")
+            .annotate(count=Count("pk"))
+            .order_by("period")
+        )
+        largest = max((row["count"] for row in buckets), default=0)
+        for row in buckets:
+            row["percent"] = round(row["count"] * 100 / largest)
+        return buckets
+
+    def get_page(self, entries, before, before_pk):
+        page = entries.order_by("-created_at", "-pk")
+        if before:
+            page = page.filter(
+                Q(created_at__lt=before) | Q(created_at=before, pk__lt=before_pk)
+            )
+        page = list(page[: self.paginate_by + 1])
+        return page[: self.paginate_by], len(page) > self.paginate_by
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        filters = self.get_timeline_filters()
+        entries = self.get_entries(filters)
+
+        page, has_more = self.get_page(entries, filters["before"], filters["before_pk"])
+        context.update(filters)
+        context["entries"] = page
+        if has_more:
+            query = self.request.GET.copy()
+            query["before"] = page[-1].created_at.isoformat()
+            query["before_pk"] = page[-1].pk
+            context["next_query"] = query.urlencode()
+
+        if not self.request.htmx:
+            context["buckets"] = self.get_buckets(entries, filters["bucket"])
+            context["buckets_choices"] = forms.DiaryTimelineForm.BUCKETS
+        return context
+
+
+# ------------------
+# FIELD UPDATE VIEWS
+# ------------------
+
+
+class FieldUpdateViewMixin(PermissionsMixin, UpdateView):
+    """
+    Inline editing of a single field of an object: the form only has that
+    field, so only that field is validated and saved.
+    """
+
+    template_name = "app/partials/field_form.html"
+    value_template_name = "app/partials/field_value.html"
+
+    def get_field(self):
+        try:
+            field = self.model._meta.get_field(self.kwargs["field"])
+        except FieldDoesNotExist:
+            raise Http404(f"No field {self.kwargs['field']} on {self.model_name}")
+        if (
+            not field.concrete
+            or not field.editable
+            or field.name in self.INLINE_EXCLUDED_FIELDS
+        ):
+            raise Http404(f"{field.name} can't be edited inline")
+        return field
+
+    def get_form_class(self):
+        return modelform_factory(
+            self.model, form=forms.FieldForm, fields=[self.get_field().name]
+        )
+
+    def get_context_data(self, **kwargs):
+        field = self.get_field()
+        context = super().get_context_data(**kwargs)
+        context["field_update_url"] = f"{self.base_url}_field_update"
+        context["name"] = field.name
+        context["label"] = field.verbose_name
+        context["editable"] = True
+        return context
+
+    def get(self, request, *args, **kwargs):
+        # Cancelling the edit asks for the value again.
+        if "value" in request.GET:
+            self.object = self.get_object()
+            return self.value_response()
+        return super().get(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        try:
+            self.object = form.save()
+        except models.VersionConflict:
+            current = type(self.object).objects.filter(pk=self.object.pk).first()
+            if current is None:
+                return deleted_response(self.request, self.base_url)
+
+            data = self.request.POST.copy()
+            data["version"] = current.version
+            self.object = current
+            form = self.get_form_class()(data, self.request.FILES, instance=current)
+            form.add_error(
+                None,
+                "Somebody else changed this item, the current value is "
+                f"{display_value(getattr(current, self.get_field().name))}. "
+                "Save again to replace it.",
+            )
+            return self.render_to_response(self.get_context_data(form=form))
+
+        pin_to_primary(self.request)
+        return self.value_response()
+
+    def value_response(self):
+        context = self.get_context_data()
+        context["value"] = display_value(getattr(self.object, context["name"]))
+        return render(self.request, self.value_template_name, context)
+
+
+class ProjectTypeFieldUpdateView(BaseProjectTypeViewMixin, FieldUpdateViewMixin): ...
+
+
+class TaskFieldUpdateView(BaseTaskViewMixin, FieldUpdateViewMixin): ...
+
+
+class LinkTypeFieldUpdateView(BaseLinkTypeViewMixin, FieldUpdateViewMixin): ...
+
+
+class LinkFieldUpdateView(BaseLinkViewMixin, FieldUpdateViewMixin): ...
+
+
+class ReviewFieldUpdateView(BaseReviewViewMixin, FieldUpdateViewMixin): ...
+
+
+class AuthorFieldUpdateView(BaseAuthorViewMixin, FieldUpdateViewMixin): ...
+
+
+class BibliographyTypeFieldUpdateView(
+    BaseBibliographyTypeViewMixin, FieldUpdateViewMixin
+): ...
+
+
+class BibliographyFieldUpdateView(BaseBibliographyViewMixin, FieldUpdateViewMixin): ...
+
+
+class CheatSheetFieldUpdateView(BaseCheatSheetViewMixin, FieldUpdateViewMixin): ...
+
+
+class TechnologyFieldUpdateView(BaseTechnologyViewMixin, FieldUpdateViewMixin): ...
+
+
+class ProjectStatusFieldUpdateView(
+    BaseProjectStatusViewMixin, FieldUpdateViewMixin
+): ...
+
+
+class ProjectFieldUpdateView(BaseProjectViewMixin, FieldUpdateViewMixin): ...
+
+
+class DiaryFieldUpdateView(BaseDiaryViewMixin, FieldUpdateViewMixin): ...
+
+
+class DiaryEntryFieldUpdateView(BaseDiaryEntryViewMixin, FieldUpdateViewMixin): ...
+
+
+class TaskTypeFieldUpdateView(BaseTaskTypeViewMixin, FieldUpdateViewMixin): ...
+
+
+class TaskStatusFieldUpdateView(BaseTaskStatusViewMixin, FieldUpdateViewMixin): ...
+
+
+class MilestoneFieldUpdateView(BaseMilestoneViewMixin, FieldUpdateViewMixin): ...
+
+
+# ------------------
+# BOARD VIEWS
+# ------------------
+
+
+class ProjectBoardView(BaseProjectViewMixin, PermissionsMixin, GenericDetailView):
+    """
+    Kanban board of the tasks of a project, a column per status. The first
+    cards of every column come from one query, numbered per status with a
+    window function; the next ones are asked column by column.
+    """
+
+    template_name = "app/project_board.html"
+    htmx_template_name = "app/partials/board_cards.html"
+    cards_per_column = 20
+
+    def get_template_names(self):
+        # The "more" button of a column only asks for its next cards.
+        if self.request.htmx:
+            return [self.htmx_template_name]
+        return [self.template_name]
+
+    def get_version(self):
+        # The page shows the tasks, not the project, its version doesn't cover it.
+        return None
+
+    def get_cards(self, status=None, offset=0):
+        tasks = models.Task.objects.filter(pk__in=self.object.all_tasks.values("pk"))
+        if status is not None:
+            tasks = tasks.filter(status=status)
+
+        return (
+            tasks.select_related("status", "task_type")
+            .annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=F("status"),
+                    order_by=[F("created_at").desc(), F("pk").desc()],
+                ),
+                column_total=Window(Count("pk"), partition_by=F("status")),
+            )
+            .filter(position__gt=offset, position__lte=offset + self.cards_per_column)
+            .order_by("status", "position")
+        )
+
+    def get_column(self, status, cards, offset=0):
+        total = cards[0].column_total if cards else 0
+        next_offset = offset + len(cards)
+        return {
+            "status": status,
+            "cards": cards,
+            "total": total,
+            "next_offset": next_offset if next_offset < total else None,
+        }
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["move_url"] = f"{self.base_url}_board_move"
+
+        if self.request.htmx:
+            try:
+                status = models.TaskStatus.objects.get(pk=self.request.GET["status"])
+                offset = max(int(self.request.GET.get("offset", 0)), 0)
+            except (KeyError, ValueError, models.TaskStatus.DoesNotExist):
+                raise BadRequest("Unknown status or offset")
+            cards = list(self.get_cards(status, offset))
+            context["column"] = self.get_column(status, cards, offset)
+            return context
+
+        cards_by_status = {}
+        for card in self.get_cards():
+            cards_by_status.setdefault(card.status_id, []).append(card)
+
+        # Statuses without tasks still get a column to drop cards into.
+        context["columns"] = [
+            self.get_column(status, cards_by_status.get(status.pk, []))
+            for status in models.TaskStatus.objects.order_by("pk")
+        ]
+        return context
+
+
+class ProjectBoardMoveView(
+    BaseProjectViewMixin, PermissionsMixin, SingleObjectMixin, View
+):
+    """
+    Applies a batch of card moves of the board, sent as "task_id:status_id"
+    pairs, with a single bulk update. Only the counts of the columns that
+    changed are sent back, the cards have already moved in the browser.
+    """
+
+    http_method_names = ["post"]
+    template_name = "app/partials/board_counts.html"
+
+    def parse_moves(self):
+        moves = {}
+        for move in self.request.POST.getlist("moves"):
+            task_id, _, status_id = move.partition(":")
+            # The last move of a card wins.
+            moves[int(task_id)] = int(status_id)
+        return moves
+
+    def post(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        try:
+            moves = self.parse_moves()
+        except ValueError:
+            return HttpResponseBadRequest("Moves must be task_id:status_id pairs")
+
+        statuses = models.TaskStatus.objects.in_bulk(set(moves.values()))
+        tasks = list(
+            models.Task.objects.filter(
+                pk__in=self.object.all_tasks.values("pk")
+            ).filter(pk__in=moves)
+        )
+        if len(statuses) != len(set(moves.values())) or len(tasks) != len(moves):
+            return HttpResponseBadRequest("Unknown task or status for this project")
+
+        now = timezone.now()
+        moved = []
+        changed_statuses = set()
+        for task in tasks:
+            status = statuses[moves[task.pk]]
+            if task.status_id == status.pk:
+                continue
+            changed_statuses.update((task.status_id, status.pk))
+            task.status = status
+            task.set_completion(status.is_done, now)
+            task.version = F("version") + 1
+            moved.append(task)
+
+        if moved:
+            # bulk_update skips save() and the signals, bump the list
+            # generation by hand.
+            models.Task.objects.bulk_update(
+                moved, ["status", "completed_at", "version"]
+            )
+            models.bump_model_generation(models.Task)
+            pin_to_primary(request)
+
+        counts = dict(
+            models.Task.objects.filter(
+                pk__in=self.object.all_tasks.values("pk"),
+                status__in=changed_statuses,
+            )
+            .values_list("status")
+            .annotate(Count("pk"))
+        )
+        return render(
+            request,
+            self.template_name,
+            {
+                "counts": [
+                    (status_pk, counts.get(status_pk, 0))
+                    for status_pk in sorted(changed_statuses)
+                ]
+            },
+        )
+
+
+# ------------------
+# STATISTICS VIEWS
+# ------------------
+
+
+class ActivityView(PermissionsMixin, ReadReplicaMixin, TemplateView):
+    """
+    Calendar heatmap of the activity of the last year, overall or of a project
+    or technology, read from the DailyActivity rollup in one query.
+    """
+
+    template_name = "app/activity.html"
+    base_url = "activity"
+    SCOPE_MODELS = {"project": models.Project, "technology": models.Technology}
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        scope = self.request.GET.get("scope", "all")
+        kinds = [
+            kind
+            for kind in self.request.GET.getlist("kind")
+            if kind in stats.ACTIVITY_SOURCES
+        ]
+
+        scope_object = None
+        if scope in self.SCOPE_MODELS:
+            try:
+                scope_object = self.SCOPE_MODELS[scope].objects.get(
+                    pk=self.request.GET.get("scope_id")
+                )
+            except (ValueError, self.SCOPE_MODELS[scope].DoesNotExist):
+                raise Http404(f"No {scope} found matching the query")
+        else:
+            scope = "all"
+
+        weeks, totals = stats.heatmap(
+            scope=scope,
+            scope_id=scope_object.pk if scope_object else 0,
+            kinds=kinds,
+        )
+        kind_names = dict(models.DailyActivity.KINDS)
+        context["weeks"] = weeks
+        context["totals"] = [
+            (kind_names[kind], total) for kind, total in totals.items()
+        ]
+        context["scope_object"] = scope_object
+        return context
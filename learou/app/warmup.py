@@ -0,0 +1,89 @@
+"""
+Fills the per-process caches before the first request.
+
+Run from the gunicorn master with preload_app, so every worker forked
+afterwards starts with them already filled.
+"""
+
+from django.db import connections
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.urls import get_resolver, reverse
+
+from learou.app import urls
+from learou.app.models import custom_model_names
+
+BREADCRUMB_ICONS = ["home", "light-bulb", "swatch", "cube", "document-plus"]
+
+
+def generic_views():
+    return (
+        urls.list_views
+        + urls.detail_views
+        + urls.update_views
+        + urls.create_views
+        + urls.delete_views
+    )
+
+
+def referenced_templates(template_name, found):
+    """
+    Adds the template and every template it extends or includes by name to
+    ``found``.
+    """
+    if template_name in found:
+        return
+    found.add(template_name)
+
+    nodelist = get_template(template_name).template.nodelist
+    for node in nodelist.get_nodes_by_type(ExtendsNode):
+        if isinstance(node.parent_name.var, str):
+            referenced_templates(node.parent_name.var, found)
+    for node in nodelist.get_nodes_by_type(IncludeNode):
+        if isinstance(node.template.var, str):
+            referenced_templates(node.template.var, found)
+
+
+def view_templates():
+    found = set()
+    for view in generic_views():
+        for template_name in (
+            view.template_name,
+            getattr(view, "htmx_template_name", None),
+        ):
+            if template_name:
+                referenced_templates(template_name, found)
+    return found
+
+
+def warm_url_resolver():
+    # Accessing the reverse dict populates the resolver, which is otherwise
+    # done on the first reverse() call of every process.
+    get_resolver().reverse_dict
+    for view in urls.list_views:
+        reverse(f"{view.base_url}_list")
+
+
+def warm_templates():
+    # Compiling a template stores it in the cached loader.
+    view_templates()
+
+    # The icons are read from a zip file the first time they're rendered.
+    breadcrumb = get_template("app/partials/base_breadcrumb.html")
+    for icon in BREADCRUMB_ICONS:
+        breadcrumb.render({"breadcrumb_url": "home", "icon": icon})
+
+
+def close_connections():
+    # Connections and pools can't be shared with forked workers.
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        if getattr(connection, "pool", None):
+            connection.close_pool()
+
+
+def warm_caches():
+    warm_url_resolver()
+    warm_templates()
+    custom_model_names()
+    close_connections()
@@ -0,0 +1,20 @@
+"""
+ASGI config for learou project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+from learou.startup_profile import install_if_enabled
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "learou.settings.dev")
+
+install_if_enabled()
+
+application = get_asgi_application()
@@ -0,0 +1,76 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    # The list generations are only kept in a cache shared by the processes.
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        }
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def respond(self):
+        self.server.requests.append((self.command, self.path, dict(self.headers)))
+        route = self.server.routes.get((self.command, self.path))
+        if route is None:
+            route = self.server.routes.get(self.path, (404, {}, b""))
+        if callable(route):
+            route = route(self)
+        status, headers, body = route
+
+        headers = dict(headers)
+        delay = headers.pop("X-Stub-Delay", 0)
+        time.sleep(delay)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_GET = do_HEAD = respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local HTTP server answering from ``routes``, keyed by path or by
+    ``(method, path)``, with a ``(status, headers, body)`` tuple or a function
+    of the request handler returning one. An ``X-Stub-Delay`` header delays
+    the answer by that many seconds.
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.routes = {}
+        self.requests = []
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+    def handle_error(self, request, client_address):
+        # The client went away, a timeout test.
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = StubServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
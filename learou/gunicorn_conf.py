@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration, used with ``gunicorn -c python:learou.gunicorn_conf``.
+
+Every value can be overridden from the environment, see
+https://docs.gunicorn.org/en/stable/settings.html for their meaning.
+"""
+
+import multiprocessing
+import os
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn_worker.UvicornWorker",
+}
+
+worker_class = WORKER_CLASSES[os.environ.get("GUNICORN_WORKER_CLASS", "gthread")]
+
+if worker_class == WORKER_CLASSES["uvicorn"]:
+    wsgi_app = "learou.asgi:application"
+else:
+    wsgi_app = "learou.wsgi:application"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+
+# Only used by the gthread worker. The database pool size defaults to it.
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Load Django, its apps and templates once in the master, the workers share
+# that memory after the fork.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Restart workers periodically to release leaked memory. The jitter keeps
+# them from restarting all at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+
+    from learou.app.warmup import warm_caches
+
+    warm_caches()
+    server.log.info("Caches warmed up")
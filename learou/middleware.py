@@ -0,0 +1,65 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+
+# Suffix of the copies written by CompressedManifestStaticFilesStorage, in
+# order of preference.
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.\w+$")
+
+
+class PrecompressedStaticFilesMiddleware:
+    """
+    Serves the collected static files, with their brotli or gzip copy when the
+    client accepts it, for deployments without nginx in front of Django.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(self.prefix):
+            response = self.serve(request, request.path.removeprefix(self.prefix))
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def accepted_variants(self, request, name):
+        accepted = request.headers.get("Accept-Encoding", "")
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding in accepted and staticfiles_storage.exists(name + suffix):
+                yield encoding, name + suffix
+
+    def serve(self, request, name):
+        try:
+            if not name or not staticfiles_storage.exists(name):
+                return None
+        except SuspiciousFileOperation:
+            return None
+
+        encoding, served_name = next(
+            self.accepted_variants(request, name), (None, name)
+        )
+        content_type, _ = mimetypes.guess_type(name)
+        response = FileResponse(
+            staticfiles_storage.open(served_name),
+            filename=os.path.basename(name),
+            content_type=content_type or "application/octet-stream",
+        )
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        patch_vary_headers(response, ["Accept-Encoding"])
+
+        if HASHED_NAME.search(name):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "public, max-age=3600"
+        return response
@@ -0,0 +1,77 @@
+"""
+Database routing between the primary database and an optional read replica.
+
+Reads only go to the replica inside ``read_from_replica()``, which the GET-only
+list and detail views enter. Everything else, and every write, uses the
+primary. After a write the session is pinned to the primary for a few seconds
+so the user doesn't read data the replica hasn't received yet.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_PIN_SESSION_KEY = "_primary_pinned_until"
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def replica_alias():
+    """
+    Returns the replica alias if one is configured, None otherwise.
+    """
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", None)
+    if alias and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+@contextmanager
+def read_from_replica():
+    token = _read_alias.set(replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def reading_from_replica():
+    """
+    Returns whether the reads currently go to the replica.
+    """
+    return _read_alias.get() is not None
+
+
+def pin_to_primary(request):
+    """
+    Keeps the reads of this session on the primary for REPLICA_PIN_SECONDS.
+    """
+    if replica_alias() is None or not hasattr(request, "session"):
+        return
+    request.session[PRIMARY_PIN_SESSION_KEY] = time.time() + getattr(
+        settings, "REPLICA_PIN_SECONDS", 5
+    )
+
+
+def is_pinned_to_primary(request):
+    if not hasattr(request, "session"):
+        return False
+    return request.session.get(PRIMARY_PIN_SESSION_KEY, 0) > time.time()
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1,39 @@
+"""
+Slim profile for workers that only serve the learou.app views.
+
+Drops Wagtail (admin, search, embeds, images, ...), the Django admin and the
+development tools, which makes the workers boot faster and use less memory.
+"""
+
+from .production import *
+
+API_EXCLUDED_APPS = [
+    "search",
+    "wagtail.contrib.forms",
+    "wagtail.contrib.redirects",
+    "wagtail.embeds",
+    "wagtail.sites",
+    "wagtail.users",
+    "wagtail.snippets",
+    "wagtail.documents",
+    "wagtail.images",
+    "wagtail.search",
+    "wagtail.admin",
+    "wagtail",
+    "modelcluster",
+    "taggit",
+    "django_filters",
+    "django.contrib.admin",
+    "rest_framework",
+    "django_extensions",
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in API_EXCLUDED_APPS]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware != "wagtail.contrib.redirects.middleware.RedirectMiddleware"
+]
+
+ROOT_URLCONF = "learou.urls_api"
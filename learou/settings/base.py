@@ -55,6 +55,8 @@ THIRD_PARTY_APPS = [
     "crispy_tailwind",
     "django_extensions",
     "heroicons",
+    "django_tasks",
+    "django_tasks.backends.database",
 ]
 
 LOCAL_APPS = [
@@ -103,17 +105,76 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 WSGI_APPLICATION = "learou.wsgi.application"
 
+ASGI_APPLICATION = "learou.asgi.application"
+
+# Serve the list and detail views from async handlers. Only worth it when
+# running under ASGI, see learou/asgi.py.
+ASYNC_VIEWS = env.bool("DJANGO_ASYNC_VIEWS", default=False)
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite is tuned for several gunicorn workers sharing the same file:
+#   - WAL lets readers run while a write is in progress.
+#   - synchronous=NORMAL is safe with WAL and avoids an fsync per commit.
+#   - busy_timeout makes writers wait for the lock instead of failing with
+#     "database is locked".
+#   - SQLITE_TRANSACTION_MODE=IMMEDIATE takes the write lock on BEGIN, so a
+#     transaction that reads and then writes can't fail half way when
+#     upgrading its lock. Off by default as it also serializes read-only
+#     atomic blocks.
+# Set SQLITE_PERFORMANCE_MODE=False to use the SQLite defaults.
+SQLITE_PERFORMANCE_MODE = env.bool("SQLITE_PERFORMANCE_MODE", default=True)
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": env.int("SQLITE_BUSY_TIMEOUT", default=5000),
+    "mmap_size": env.int("SQLITE_MMAP_SIZE", default=128 * 1024 * 1024),
+    # Negative values are KiB instead of pages.
+    "cache_size": env.int("SQLITE_CACHE_SIZE", default=-32 * 1024),
+    "temp_store": "MEMORY",
+}
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        "OPTIONS": {},
     }
 }
 
+if SQLITE_PERFORMANCE_MODE:
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": ";".join(
+            f"PRAGMA {pragma}={value}" for pragma, value in SQLITE_PRAGMAS.items()
+        ),
+        "transaction_mode": env("SQLITE_TRANSACTION_MODE", default=None),
+        "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000,
+    }
+
+
+# Read replica
+# GET-only list and detail views read from the "replica" alias when it is
+# configured, see learou.routers. Point SQLITE_REPLICA_NAME to a copy of the
+# database to try it locally.
+DATABASE_ROUTERS = ["learou.routers.PrimaryReplicaRouter"]
+
+DATABASE_REPLICA_ALIAS = "replica"
+
+# Seconds a session keeps reading from the primary after a write.
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=5)
+
+SQLITE_REPLICA_NAME = env("SQLITE_REPLICA_NAME", default=None)
+
+if SQLITE_REPLICA_NAME:
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES["default"],
+        "NAME": SQLITE_REPLICA_NAME,
+        "TEST": {"MIRROR": "default"},
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -170,6 +231,14 @@ STORAGES = {
     "default": {
         "BACKEND": "django.core.files.storage.FileSystemStorage",
     },
+    # Deduplicates the AbstractType icons, see learou.app.storage.
+    "icons": {
+        "BACKEND": "learou.app.storage.ContentAddressedStorage",
+        "OPTIONS": {
+            "location": MEDIA_ROOT,
+            "base_url": MEDIA_URL,
+        },
+    },
     # ManifestStaticFilesStorage is recommended in production, to prevent
     # outdated JavaScript / CSS assets being served from cache
     # (e.g. after a Wagtail upgrade).
@@ -216,5 +285,50 @@ WAGTAILDOCS_EXTENSIONS = [
     "xlsx",
     "zip",
 ]
+# Background tasks
+# https://github.com/RealOrangeOne/django-tasks
+# Tasks run right away in the request by default, the production settings
+# queue them in the database for the workers, see the run_task_workers command.
+TASKS = {
+    "default": {
+        "BACKEND": env(
+            "DJANGO_TASKS_BACKEND",
+            default="django_tasks.backends.immediate.ImmediateBackend",
+        ),
+        "QUEUES": ["default", "renditions", "links", "exports", "search"],
+    }
+}
+
+# Worker processes started for each queue by run_task_workers, queues missing
+# here get one.
+TASK_QUEUE_CONCURRENCY = {
+    "default": env.int("TASK_DEFAULT_CONCURRENCY", default=1),
+    "renditions": env.int("TASK_RENDITIONS_CONCURRENCY", default=2),
+    "links": env.int("TASK_LINKS_CONCURRENCY", default=2),
+    "exports": env.int("TASK_EXPORTS_CONCURRENCY", default=1),
+    "search": env.int("TASK_SEARCH_CONCURRENCY", default=1),
+}
+
+# Deleting an item only hides it, with the rows deleted with it, and the
+# purge_deleted task removes them once they have been restorable for
+# SOFT_DELETE_RETENTION_HOURS, see learou.app.cascade.
+SOFT_DELETE = env.bool("DJANGO_SOFT_DELETE", default=True)
+SOFT_DELETE_RETENTION_HOURS = env.int("SOFT_DELETE_RETENTION_HOURS", default=72)
+SOFT_DELETE_PURGE_BATCH_SIZE = env.int("SOFT_DELETE_PURGE_BATCH_SIZE", default=500)
+# Batches a purge_deleted task runs before it enqueues itself again.
+SOFT_DELETE_PURGE_BATCHES = env.int("SOFT_DELETE_PURGE_BATCHES", default=20)
+
+# Minutes between the runs of the rollup_activity task scheduled by
+# run_task_workers, see learou.app.stats.
+ROLLUP_ACTIVITY_INTERVAL_MINUTES = env.int(
+    "ROLLUP_ACTIVITY_INTERVAL_MINUTES", default=60
+)
+
+# Seconds the custom model names are cached for, see
+# learou.app.models.custom_model_names.
+CUSTOM_MODEL_NAMES_CACHE_TIMEOUT = env.int(
+    "CUSTOM_MODEL_NAMES_CACHE_TIMEOUT", default=60
+)
+
 LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/"
@@ -8,6 +8,86 @@ except ImportError:
     pass
 
 
+# Templates
+# Compile every template once per process. The cached loader is Django's
+# default too, but only when the loaders aren't customized, so it's explicit
+# here. learou.app.warmup fills it before gunicorn forks the workers.
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+
+# Static files
+# Precompress the hashed assets during collectstatic, see learou.app.storage.
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {
+        "BACKEND": "learou.app.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Without nginx in front, Django serves the static files and their
+# precompressed copies itself.
+if env.bool("DJANGO_SERVE_STATIC", default=False):
+    MIDDLEWARE = ["learou.middleware.PrecompressedStaticFilesMiddleware", *MIDDLEWARE]
+
+
+# Cache
+# Shared by every worker, the list ETags rely on it to see the changes made by
+# the other processes, see learou.app.models.model_generation.
+REDIS_URL = env("REDIS_URL", default=None)
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+
+# Background tasks
+# Queued in the database and run by the run_task_workers processes.
+TASKS["default"]["BACKEND"] = env(
+    "DJANGO_TASKS_BACKEND", default="django_tasks.backends.database.DatabaseBackend"
+)
+
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/databases/#postgresql-notes
+#
+# Two connection strategies are available, pick one with DJANGO_DB_POOL:
+#   - Persistent connections (default): every gunicorn thread keeps its own
+#     connection open for CONN_MAX_AGE seconds instead of reconnecting on each
+#     request.
+#   - Native psycopg pool: every gunicorn worker process holds a pool shared by
+#     its threads. Django doesn't allow pooling together with CONN_MAX_AGE, so
+#     persistent connections are disabled when the pool is enabled.
+
+DB_POOL = env.bool("DJANGO_DB_POOL", default=False)
+
+# One connection per gunicorn thread is enough, extra ones would only sit idle.
+# The total number of server connections is workers * DB_POOL_MAX_SIZE, keep it
+# below the postgres `max_connections`.
+DB_POOL_MAX_SIZE = env.int(
+    "DJANGO_DB_POOL_MAX_SIZE", default=env.int("GUNICORN_THREADS", default=4)
+)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -16,5 +96,32 @@ DATABASES = {
         "PASSWORD": env("POSTGRES_PASSWORD"),
         "HOST": env("POSTGRES_HOST"),
         "PORT": env("POSTGRES_PORT"),
+        "CONN_MAX_AGE": 0 if DB_POOL else env.int("DJANGO_CONN_MAX_AGE", default=60),
+        # Checks the connection is still usable before reusing it, so a
+        # postgres restart doesn't surface as errors on the next requests.
+        "CONN_HEALTH_CHECKS": env.bool("DJANGO_CONN_HEALTH_CHECKS", default=True),
+        "OPTIONS": {},
     }
 }
+
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": env.int("DJANGO_DB_POOL_MIN_SIZE", default=1),
+        "max_size": DB_POOL_MAX_SIZE,
+        # Seconds a request waits for a free connection before failing.
+        "timeout": env.float("DJANGO_DB_POOL_TIMEOUT", default=10.0),
+        # Recycle connections periodically to release server side memory.
+        "max_lifetime": env.float("DJANGO_DB_POOL_MAX_LIFETIME", default=3600.0),
+        "max_idle": env.float("DJANGO_DB_POOL_MAX_IDLE", default=600.0),
+    }
+
+# Read replica, see learou.routers.
+POSTGRES_REPLICA_HOST = env("POSTGRES_REPLICA_HOST", default=None)
+
+if POSTGRES_REPLICA_HOST:
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES["default"],
+        "HOST": POSTGRES_REPLICA_HOST,
+        "PORT": env("POSTGRES_REPLICA_PORT", default=env("POSTGRES_PORT")),
+        "TEST": {"MIRROR": "default"},
+    }
@@ -0,0 +1,35 @@
+import tempfile
+
+from .dev import *
+
+# Files rather than the in-memory default, so closing a connection really
+# closes it and the replica is a database of its own.
+DATABASES["default"]["TEST"] = {"NAME": os.path.join(BASE_DIR, "test_db.sqlite3")}
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "NAME": os.path.join(BASE_DIR, "replica.sqlite3"),
+    # Created from the models, the data migrations of some apps write to the
+    # default alias whatever database they migrate.
+    "TEST": {
+        "NAME": os.path.join(BASE_DIR, "test_replica.sqlite3"),
+        "MIGRATE": False,
+    },
+}
+# Off unless a test turns it on, see learou/tests/test_routers.py.
+DATABASE_REPLICA_ALIAS = None
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix="learou-test-media-")
+
+STORAGES = {
+    **STORAGES,
+    "icons": {
+        "BACKEND": "learou.app.storage.ContentAddressedStorage",
+        "OPTIONS": {"location": MEDIA_ROOT, "base_url": MEDIA_URL},
+    },
+    # The tests don't run collectstatic.
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
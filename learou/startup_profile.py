@@ -0,0 +1,80 @@
+"""
+Measures how long every installed app takes to start.
+
+Set LEAROU_STARTUP_PROFILE=1 to print, once Django is set up, the time spent by
+each app importing its AppConfig, importing its models and running ready().
+"""
+
+import os
+import sys
+import time
+
+from django.apps import AppConfig
+from django.apps.registry import Apps
+
+
+def is_enabled():
+    return os.environ.get("LEAROU_STARTUP_PROFILE", "").lower() in ("1", "true")
+
+
+def timed(timings, label, step, function):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timings.setdefault(label, {})[step] = time.perf_counter() - start
+
+    return wrapper
+
+
+def install(report=None):
+    """
+    Patches the app registry to time the next populate() call, which is run
+    by django.setup(). ``report`` receives the timings, by default they are
+    written to stderr.
+    """
+    timings = {}
+    original_create = AppConfig.create.__func__
+    original_populate = Apps.populate
+
+    def create(cls, entry):
+        start = time.perf_counter()
+        app_config = original_create(cls, entry)
+        timings.setdefault(app_config.label, {})["import"] = time.perf_counter() - start
+        app_config.import_models = timed(
+            timings, app_config.label, "models", app_config.import_models
+        )
+        app_config.ready = timed(timings, app_config.label, "ready", app_config.ready)
+        return app_config
+
+    def populate(self, installed_apps=None):
+        start = time.perf_counter()
+        try:
+            original_populate(self, installed_apps)
+        finally:
+            AppConfig.create = classmethod(original_create)
+            Apps.populate = original_populate
+        total = time.perf_counter() - start
+        (report or write_report)(timings, total)
+
+    AppConfig.create = classmethod(create)
+    Apps.populate = populate
+
+
+def install_if_enabled():
+    if is_enabled():
+        install()
+
+
+def write_report(timings, total):
+    sys.stderr.write(f"Apps loaded in {total * 1000:.1f} ms\n")
+    for label, steps in sorted(
+        timings.items(), key=lambda item: sum(item[1].values()), reverse=True
+    ):
+        sys.stderr.write(
+            f"{label:<30} "
+            f"import {steps.get('import', 0) * 1000:7.1f} ms  "
+            f"models {steps.get('models', 0) * 1000:7.1f} ms  "
+            f"ready {steps.get('ready', 0) * 1000:7.1f} ms\n"
+        )
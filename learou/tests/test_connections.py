@@ -0,0 +1,38 @@
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+
+def get(handler, path):
+    environ = {"PATH_INFO": path}
+    setup_testing_defaults(environ)
+    response = handler(environ, lambda status, headers: None)
+    b"".join(response)
+    # Sends request_finished, which closes the connections past CONN_MAX_AGE,
+    # as a WSGI server does. The test client doesn't.
+    response.close()
+    return response
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("conn_max_age, connections", [(60, 1), (0, 2)])
+def test_connection_reused_across_requests(monkeypatch, conn_max_age, connections):
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", conn_max_age)
+    connection.close()
+    created = []
+
+    def count(sender, connection, **kwargs):
+        created.append(connection.alias)
+
+    connection_created.connect(count)
+    try:
+        handler = WSGIHandler()
+        for _ in range(2):
+            assert get(handler, "/api/task_status/").status_code == 200
+    finally:
+        connection_created.disconnect(count)
+
+    assert created.count("default") == connections
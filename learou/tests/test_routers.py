@@ -0,0 +1,106 @@
+import pytest
+from django.urls import reverse
+
+from learou.app.models import TaskStatus
+from learou.routers import PrimaryReplicaRouter, read_from_replica
+
+pytestmark = pytest.mark.django_db(databases=["default", "replica"])
+
+
+@pytest.fixture(autouse=True)
+def replica(settings):
+    settings.DATABASE_REPLICA_ALIAS = "replica"
+
+
+@pytest.fixture
+def statuses():
+    # Different rows on each database tell where a page was read from.
+    return (
+        TaskStatus.objects.create(name="On the primary"),
+        TaskStatus.objects.using("replica").create(name="On the replica"),
+    )
+
+
+@pytest.fixture
+def user(django_user_model, client):
+    user = django_user_model.objects.create_user("editor", password="password")
+    client.force_login(user)
+    return user
+
+
+def names():
+    return list(TaskStatus.objects.values_list("name", flat=True))
+
+
+def test_router_only_reads_from_replica_when_asked():
+    router = PrimaryReplicaRouter()
+    assert router.db_for_read(TaskStatus) is None
+
+    with read_from_replica():
+        assert router.db_for_read(TaskStatus) == "replica"
+        assert router.db_for_write(TaskStatus) == "default"
+
+
+def test_queries_read_from_replica_when_asked(statuses):
+    assert names() == ["On the primary"]
+    with read_from_replica():
+        assert names() == ["On the replica"]
+
+
+def test_writes_go_to_primary_while_reading_from_replica():
+    with read_from_replica():
+        TaskStatus.objects.create(name="Created")
+
+    assert names() == ["Created"]
+    assert not TaskStatus.objects.using("replica").exists()
+
+
+def test_without_replica_reads_go_to_primary(settings, statuses):
+    settings.DATABASE_REPLICA_ALIAS = None
+
+    with read_from_replica():
+        assert names() == ["On the primary"]
+
+
+def test_list_and_detail_read_from_replica(client, statuses):
+    response = client.get(reverse("task_status_list"))
+    assert b"On the replica" in response.content
+    assert b"On the primary" not in response.content
+
+    replica_status = statuses[1]
+    response = client.get(reverse("task_status_detail", args=[replica_status.pk]))
+    assert b"On the replica" in response.content
+
+
+def test_session_reads_from_primary_after_a_write(client, statuses, user):
+    response = client.post(reverse("task_status_create"), {"name": "Created"})
+
+    assert response.status_code == 302
+    assert TaskStatus.objects.filter(name="Created").exists()
+    assert not TaskStatus.objects.using("replica").filter(name="Created").exists()
+
+    response = client.get(reverse("task_status_list"))
+    assert b"Created" in response.content
+    assert b"On the primary" in response.content
+
+
+def test_session_reads_from_replica_once_the_pin_expires(
+    client, settings, statuses, user
+):
+    settings.REPLICA_PIN_SECONDS = 0
+    client.post(reverse("task_status_create"), {"name": "Created"})
+
+    response = client.get(reverse("task_status_list"))
+    assert b"On the replica" in response.content
+    assert b"Created" not in response.content
+
+
+def test_list_from_replica_validated_against_replica(client, shared_cache, statuses):
+    url = reverse("task_status_list")
+    etag = client.get(url).headers["ETag"]
+    # Replicated later, the primary has already bumped its generation.
+    TaskStatus.objects.using("replica").bulk_create([TaskStatus(name="Replicated")])
+
+    response = client.get(url, headers={"if-none-match": etag})
+    assert response.status_code == 200
+    assert b"Replicated" in response.content
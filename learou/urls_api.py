@@ -0,0 +1,16 @@
+"""
+URLs of the slim learou.settings.api profile, without the Wagtail and Django
+admin sites.
+"""
+
+from django.urls import include, path
+
+from learou.views import Home, Features, LogOut
+
+urlpatterns = [
+    path("api/", include("learou.app.urls")),
+    path("accounts/", include("django.contrib.auth.urls")),
+    path("", Home.as_view(), name="home"),
+    path("features/", Features.as_view(), name="features"),
+    path("log-out/", LogOut.as_view(), name="log_out"),
+]
@@ -11,6 +11,10 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from learou.startup_profile import install_if_enabled
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "learou.settings.dev")
 
+install_if_enabled()
+
 application = get_wsgi_application()